@@ -0,0 +1,357 @@
+#%% MODULE BEGINS
+# module_name = "analysis_service.py"
+
+"""
+Description:
+    Long-running local analysis service. Loads the dataset once, keeps it warm in
+    memory and answers statistics, query, probability, vector and plot requests
+    over HTTP on localhost or a Unix socket.
+
+    Run with:  python -m src.analysis_service --port 8340
+    Example:   curl "http://127.0.0.1:8340/stats?column=arr_delay&stat=mean"
+"""
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+# Third-Party Library Imports
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+# Relative Imports
+from .config import DATA_PATH, OUTPUT_FOLDER, ANALYSIS_COLUMNS
+from .data_operations import DataVisualizer
+from .plot_cache import PlotCache
+from .probability_calc import ProbabilityCalculations
+from .vector_operations import VectorOperations
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8340
+HTTP_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+# Operations served by the /plot endpoint whose extra columns must be loaded
+PLOT_OPERATIONS = ["categorize_airports", "plot_violin", "plot_box", "plot_scatter"]
+
+
+#%% CLASS DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class AnalysisService:
+    """
+    Asyncio HTTP service over a warm, in-memory dataset.
+
+    Features:
+    - The dataset is loaded and indexed once and shared by all analysis classes.
+    - CPU-bound work runs in a thread pool so the event loop stays responsive.
+    - Derived metrics are added to the shared dataset at load, so requests only read it;
+      handlers lock just the objects they mutate: one lock for pyplot and the visualizer
+      (plots, query cache), one for the calculators (numeric store, stats cache, results).
+    - Concurrent identical requests are coalesced into one computation.
+    - Results are kept in a bounded LRU cache.
+
+    Endpoints (GET, JSON responses):
+    - /health
+    - /stats?column=arr_delay&stat=mean|median|std
+    - /query?column=arr_delay&condition=>&value=10&limit=20
+    - /probability?kind=joint|conditional|counts&col1=carrier&col2=month
+    - /vector?column1=arr_delay&column2=arr_flights&operations=Dot Product,Orthogonal
+    - /plot?kind=violin|box|histogram&column=arr_delay  or  /plot?kind=scatter&x=..&y=..
+    - /cache  (cache and coalescing statistics)
+    """
+
+    def __init__(self, config=None, cache_size=256, max_workers=None):
+        """
+        Initialize the service.
+
+        Args:
+        - config: Dictionary containing configuration (DATA_PATH, OUTPUT_FOLDER)
+        - cache_size: Maximum number of cached results
+        - max_workers: Threads used for CPU-bound work
+        """
+        self.config = config or {"DATA_PATH": DATA_PATH, "OUTPUT_FOLDER": OUTPUT_FOLDER}
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.in_flight = {}
+        self.cache_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Per-resource locks: pyplot's global state and the visualizer, and the calculators
+        self.plot_lock = threading.Lock()
+        self.calculator_lock = threading.Lock()
+        self.handlers = {
+            "/health": self.handle_health,
+            "/stats": self.handle_stats,
+            "/query": self.handle_query,
+            "/probability": self.handle_probability,
+            "/vector": self.handle_vector,
+            "/plot": self.handle_plot,
+        }
+        self.handler_locks = {
+            "/stats": self.calculator_lock,
+            "/query": self.plot_lock,
+            "/probability": self.calculator_lock,
+            "/vector": self.calculator_lock,
+            "/plot": self.plot_lock,
+        }
+        self.vector_ops = None
+        self.calculator = None
+        self.visualizer = None
+
+    def load(self):
+        """Load the dataset once and share it across the analysis classes."""
+        start = time.perf_counter()
+        # Plots are written to files only; no GUI windows in server mode
+        plt.switch_backend("Agg")
+        warnings.filterwarnings("ignore", message=".*non-interactive.*")
+
+        # Only the columns the endpoints can use are read, unless config names them (column projection)
+        self.visualizer = DataVisualizer()
+        columns = self.config.get("COLUMNS") or self.visualizer.columns_for(PLOT_OPERATIONS, ANALYSIS_COLUMNS)
+        self.vector_ops = VectorOperations({**self.config, "COLUMNS": columns})
+        # Add every computable derived metric now, so requests never change the shared frame;
+        # the numeric store is rebuilt below to include them
+        metrics = self.vector_ops.derived_metrics
+        metrics.materialize(self.vector_ops.data, [
+            name for name in metrics.names if metrics.source_columns(name) <= set(self.vector_ops.data.columns)])
+        self.vector_ops.numeric_store = None
+        self.calculator = ProbabilityCalculations(self.config)
+        self.calculator.data = self.vector_ops.data
+        self.calculator.loaded_columns = self.vector_ops.loaded_columns
+        self.calculator.numeric_store = self.vector_ops.get_numeric_store()
+        self.visualizer.loaded_columns = self.vector_ops.loaded_columns
+        self.visualizer.DATA_PATH = self.config["DATA_PATH"]
+        self.visualizer.output_folder = self.config["OUTPUT_FOLDER"]
+        self.visualizer.plot_cache = PlotCache(self.config["OUTPUT_FOLDER"])
+        self.visualizer.data_df = self.vector_ops.data
+        self.visualizer.categorize_airports()
+        logging.info(f"Dataset loaded in {time.perf_counter() - start:.2f}s "
+                     f"({len(self.vector_ops.data)} rows)")
+
+    # --------------------
+    # Request handlers (run in the executor)
+    # --------------------
+
+    def handle_health(self, params):
+        return {"status": "ok", "rows": len(self.vector_ops.data)}
+
+    def handle_stats(self, params):
+        column = self._require(params, "column")
+        stat = params.get("stat", "mean")
+        methods = {"mean": self.calculator.calculate_mean, "median": self.calculator.calculate_median,
+                   "std": self.calculator.calculate_std}
+        if stat not in methods:
+            raise ValueError(f"Unsupported stat '{stat}'. Use one of: {', '.join(methods)}.")
+        self.calculator.validate_column(column)
+        return {"column": column, "stat": stat, "value": methods[stat](column)}
+
+    def handle_query(self, params):
+        column = self._require(params, "column")
+        condition = self._require(params, "condition")
+        value = self._parse_value(self._require(params, "value"))
+        limit = int(params.get("limit", 20))
+        result_df = self.visualizer.query_data(column, condition, value)
+        return {"rows": len(result_df), "head": result_df.head(limit)}
+
+    def handle_probability(self, params):
+        kind = params.get("kind", "joint")
+        col1 = self._require(params, "col1")
+        col2 = self._require(params, "col2")
+        if kind == "joint":
+            table = self.calculator.calculate_joint_probability(col1, col2)
+        elif kind == "conditional":
+            table = self.calculator.calculate_conditional_probability(col1, col2)
+        elif kind == "counts":
+            table = self.calculator.calculate_joint_counts(col1, col2)
+        else:
+            raise ValueError(f"Unsupported kind '{kind}'. Use one of: joint, conditional, counts.")
+        return {"kind": kind, "table": table}
+
+    def handle_vector(self, params):
+        column1 = self._require(params, "column1")
+        column2 = self._require(params, "column2")
+        operations = params.get("operations")
+        operations = [op.strip() for op in operations.split(",")] if operations else list(
+            self.vector_ops.SCALAR_OPERATIONS)
+        results, _, _ = self.vector_ops.perform_vector_operations(column1, column2, operations)
+        return {"column1": column1, "column2": column2, "results": results}
+
+    def handle_plot(self, params):
+        kind = self._require(params, "kind")
+        self.visualizer.last_plot_file = None
+        if kind == "violin":
+            self.visualizer.plot_violin(self._require(params, "column"))
+        elif kind == "box":
+            self.visualizer.plot_box(self._require(params, "column"))
+        elif kind == "histogram":
+            self.visualizer.visualize_delay_histogram(self._require(params, "column"))
+        elif kind == "scatter":
+            self.visualizer.plot_scatter(self._require(params, "x"), self._require(params, "y"))
+        else:
+            raise ValueError(f"Unsupported plot kind '{kind}'. Use one of: violin, box, histogram, scatter.")
+        if self.visualizer.last_plot_file is None:
+            raise ValueError(f"The {kind} plot could not be created; check the column names.")
+        return {"kind": kind, "file": self.visualizer.last_plot_file}
+
+    @staticmethod
+    def _require(params, name):
+        if not params.get(name):
+            raise ValueError(f"Missing required parameter '{name}'.")
+        return params[name]
+
+    @staticmethod
+    def _parse_value(raw):
+        """Interpret a query value as a number when possible, otherwise as a string."""
+        try:
+            return float(raw)
+        except ValueError:
+            return raw
+
+    def _run_handler(self, path, params):
+        """Run a handler in a worker thread, holding the lock of the resource it uses."""
+        if path not in self.handler_locks:
+            return self.handlers[path](params)
+        with self.handler_locks[path]:
+            return self.handlers[path](params)
+
+    # --------------------
+    # Caching and coalescing
+    # --------------------
+
+    async def dispatch(self, path, params):
+        """
+        Answer a request from the cache, an identical in-flight computation, or the executor.
+        """
+        if path == "/cache":
+            return dict(self.cache_stats, entries=len(self.cache), in_flight=len(self.in_flight))
+        if path not in self.handlers:
+            raise LookupError(f"Unknown endpoint '{path}'.")
+
+        key = (path, tuple(sorted(params.items())))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.cache_stats["hits"] += 1
+            return self.cache[key]
+        if key in self.in_flight:
+            self.cache_stats["coalesced"] += 1
+            return await asyncio.shield(self.in_flight[key])
+
+        self.cache_stats["misses"] += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self._run_handler, path, params)
+        self.in_flight[key] = future
+        try:
+            result = await future
+        finally:
+            del self.in_flight[key]
+
+        # Health checks must reflect the live state and are not cached
+        if path != "/health":
+            self.cache[key] = result
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return result
+
+    # --------------------
+    # HTTP handling
+    # --------------------
+
+    async def handle_connection(self, reader, writer):
+        """Read one HTTP request, dispatch it and write a JSON response."""
+        status, payload = 200, None
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            # Skip headers; requests carry their parameters in the query string
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            method, target, _ = request_line.split(" ", 2)
+            if method != "GET":
+                status, payload = 405, {"error": "Only GET is supported."}
+            else:
+                url = urlsplit(target)
+                payload = await self.dispatch(url.path, dict(parse_qsl(url.query)))
+        except LookupError as e:
+            status, payload = 404, {"error": str(e)}
+        except (ValueError, RuntimeError) as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            logging.error(f"Request failed: {e}")
+            status, payload = 500, {"error": str(e)}
+
+        body = json.dumps(self._to_json(payload), allow_nan=False).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {HTTP_STATUS[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode("latin-1") + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    @classmethod
+    def _to_json(cls, value):
+        """Convert results to JSON-serializable values; NaN and infinities become null."""
+        if isinstance(value, dict):
+            return {str(key): cls._to_json(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [cls._to_json(item) for item in value]
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float):
+            return value if np.isfinite(value) else None
+        if value is None or isinstance(value, (str, int, bool)):
+            return value
+        if isinstance(value, np.ndarray):
+            return cls._to_json(value.tolist())
+        if isinstance(value, pd.DataFrame):
+            # pandas writes missing values as null
+            return json.loads(value.to_json(orient="split"))
+        if isinstance(value, pd.Series):
+            return json.loads(value.to_json())
+        return str(value)
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None):
+        """Load the dataset and serve requests until cancelled."""
+        self.load()
+        if unix_socket:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_socket)
+            logging.info(f"Analysis service listening on unix:{unix_socket}")
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            logging.info(f"Analysis service listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+#%% FUNCTION DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def main():
+    """
+    Start the analysis service from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Airport delay analysis service")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Host to bind (default: localhost)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to bind")
+    parser.add_argument("--unix", dest="unix_socket", help="Serve on this Unix socket path instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=256, help="Maximum number of cached results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    service = AnalysisService(cache_size=args.cache_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix_socket))
+    except KeyboardInterrupt:
+        logging.info("Analysis service stopped.")
+
+
+if __name__ == "__main__":
+    main()
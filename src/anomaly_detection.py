@@ -0,0 +1,244 @@
+#%% MODULE BEGINS
+# module_name = "anomaly_detection.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import os
+import pickle
+
+# Third-Party Library Imports
+import pandas as pd
+import numpy as np
+
+# Relative Imports
+from .probability_calc import ProbabilityCalculations
+from .data_loader import iter_chunks
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+DELAY_COLUMNS = ("arr_delay", "carrier_delay", "weather_delay", "nas_delay",
+                 "security_delay", "late_aircraft_delay")
+MAD_SCALE = 1.4826  # MAD of a normal distribution times this equals its standard deviation
+MEAN_AD_SCALE = 1.2533  # Same for the mean absolute deviation; used when the MAD is zero
+BASELINE_STATS = ("count", "median", "mad", "mean_ad", "q1", "q3")
+
+
+class AnomalyDetector(ProbabilityCalculations):
+    """
+    Extends ProbabilityCalculations with robust, per-group anomaly detection.
+
+    Features:
+    - Per-group baselines (median, MAD, quartiles) for many columns, computed for all
+      groups at once from one sort per column; no per-group Python loops.
+    - Robust z-scores (median/MAD) and IQR fences, flagged together.
+    - Baselines can be saved and later used to score new monthly data chunk by chunk.
+    """
+    OPERATION_COLUMNS = {
+        "detect_anomalies": list(DELAY_COLUMNS) + ["airport"],
+        "build_baselines": list(DELAY_COLUMNS) + ["airport"],
+    }
+
+    def __init__(self, config):
+        """
+        Initialize the anomaly detector with configurations.
+
+        Args:
+        - config: Dictionary containing configuration (e.g., data path).
+        """
+        super().__init__(config)
+        self.baselines = None
+        self.group_columns = None
+
+    # --------------------
+    # Vectorized grouped statistics
+    # --------------------
+
+    @staticmethod
+    def _group_keys(frame, group_columns):
+        """Return the group key of every row as an Index (one column) or MultiIndex."""
+        if len(group_columns) == 1:
+            return pd.Index(frame[group_columns[0]], name=group_columns[0])
+        return pd.MultiIndex.from_frame(frame[list(group_columns)])
+
+    @staticmethod
+    def _grouped_quantiles(codes, values, n_groups, quantiles):
+        """
+        Quantiles (linear interpolation, as numpy.quantile) of values for every group.
+
+        Rows are sorted once by (group, value); each group is then a contiguous slice
+        and every quantile is read at a computed position inside it.
+
+        Returns:
+        - tuple: (counts per group, array of shape (len(quantiles), n_groups))
+        """
+        keep = ~np.isnan(values)
+        codes, values = codes[keep], values[keep]
+        order = np.lexsort((values, codes))
+        sorted_values = values[order]
+        counts = np.bincount(codes, minlength=n_groups)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        result = np.full((len(quantiles), n_groups), np.nan)
+        present = counts > 0
+        for i, q in enumerate(quantiles):
+            position = starts[present] + q * (counts[present] - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.ceil(position).astype(np.int64)
+            fraction = position - lower
+            result[i, present] = sorted_values[lower] + fraction * (sorted_values[upper] - sorted_values[lower])
+        return counts, result
+
+    def _baseline_for(self, codes, values, n_groups):
+        """Count, median, MAD, mean absolute deviation and quartiles of one column per group."""
+        counts, (q1, median, q3) = self._grouped_quantiles(codes, values, n_groups, (0.25, 0.5, 0.75))
+        deviations = np.abs(values - median[codes])
+        _, (mad,) = self._grouped_quantiles(codes, deviations, n_groups, (0.5,))
+        valid = ~np.isnan(deviations)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_ad = np.bincount(codes[valid], weights=deviations[valid], minlength=n_groups) / counts
+        return {"count": counts, "median": median, "mad": mad, "mean_ad": mean_ad, "q1": q1, "q3": q3}
+
+    # --------------------
+    # Baselines
+    # --------------------
+
+    def build_baselines(self, group_columns=("airport",), columns=DELAY_COLUMNS):
+        """
+        Compute per-group baselines for the given columns over the loaded data.
+
+        Args:
+        - group_columns: Column(s) defining the peer groups (e.g. ('airport',) or ('carrier', 'airport'))
+        - columns: Numeric columns to build baselines for
+
+        Returns:
+        - DataFrame indexed by group with '<column>_<stat>' columns for each stat in BASELINE_STATS
+        """
+        if isinstance(group_columns, str):
+            group_columns = (group_columns,)
+        group_columns = tuple(group_columns)
+        for column in group_columns + tuple(columns):
+            self.validate_column(column)
+
+        codes, groups = self._group_keys(self.data, group_columns).factorize(sort=True)
+        # Rows with a missing group key go to an extra bucket that is dropped
+        codes = np.where(codes < 0, len(groups), codes)
+        baselines = pd.DataFrame(index=groups)
+        for column in columns:
+            stats = self._baseline_for(codes, self.data[column].to_numpy(dtype=float), len(groups) + 1)
+            for stat in BASELINE_STATS:
+                baselines[f"{column}_{stat}"] = stats[stat][:len(groups)]
+
+        self.baselines = baselines
+        self.group_columns = group_columns
+        return baselines
+
+    def save_baselines(self, filename="anomaly_baselines.pkl"):
+        """Save the current baselines to the output folder for later streaming use."""
+        if self.baselines is None:
+            raise ValueError("No baselines to save. Call build_baselines first.")
+        os.makedirs(self.output_folder, exist_ok=True)
+        filepath = os.path.join(self.output_folder, filename)
+        with open(filepath, "wb") as file:
+            pickle.dump({"group_columns": self.group_columns, "baselines": self.baselines}, file)
+        print(f"Baselines saved to {filepath}")
+        return filepath
+
+    def load_baselines(self, filename="anomaly_baselines.pkl"):
+        """Load baselines saved by save_baselines."""
+        filepath = os.path.join(self.output_folder, filename)
+        with open(filepath, "rb") as file:
+            stored = pickle.load(file)
+        self.group_columns = stored["group_columns"]
+        self.baselines = stored["baselines"]
+        return self.baselines
+
+    # --------------------
+    # Scoring
+    # --------------------
+
+    def score(self, frame=None, columns=None, z_threshold=3.5, iqr_multiplier=1.5):
+        """
+        Score rows against the stored group baselines.
+
+        The robust z-score is (value - median) / (1.4826 * MAD); when a group's MAD is
+        zero, 1.2533 * mean absolute deviation is used instead. A value is flagged when
+        |z| exceeds z_threshold or it falls outside [q1 - k*IQR, q3 + k*IQR].
+        Rows whose group has no baseline get NaN scores and are never flagged.
+
+        Args:
+        - frame: DataFrame to score (defaults to the loaded data)
+        - columns: Columns to score (defaults to every column with a baseline)
+        - z_threshold: Robust z-score cut-off
+        - iqr_multiplier: Fence multiplier k
+
+        Returns:
+        - DataFrame aligned with frame with '<column>_robust_z', '<column>_outside_iqr'
+          columns and an overall 'is_anomaly' flag
+        """
+        if self.baselines is None:
+            raise ValueError("No baselines available. Call build_baselines or load_baselines first.")
+        frame = self.data if frame is None else frame
+        if columns is None:
+            columns = [name[:-len("_median")] for name in self.baselines.columns if name.endswith("_median")]
+
+        positions = self.baselines.index.get_indexer(self._group_keys(frame, self.group_columns))
+        known = positions >= 0
+        positions = np.where(known, positions, 0)
+
+        scores = pd.DataFrame(index=frame.index)
+        is_anomaly = np.zeros(len(frame), dtype=bool)
+        for column in columns:
+            baseline = {stat: self.baselines[f"{column}_{stat}"].to_numpy()[positions] for stat in BASELINE_STATS}
+            values = frame[column].to_numpy(dtype=float)
+            scale = np.where(baseline["mad"] > 0, MAD_SCALE * baseline["mad"], MEAN_AD_SCALE * baseline["mean_ad"])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                robust_z = np.where(known & (scale > 0), (values - baseline["median"]) / scale, np.nan)
+            iqr = baseline["q3"] - baseline["q1"]
+            outside = known & ((values < baseline["q1"] - iqr_multiplier * iqr)
+                               | (values > baseline["q3"] + iqr_multiplier * iqr))
+            scores[f"{column}_robust_z"] = robust_z
+            scores[f"{column}_outside_iqr"] = outside
+            is_anomaly |= outside | (np.abs(np.nan_to_num(robust_z)) > z_threshold)
+        scores["is_anomaly"] = is_anomaly
+        return scores
+
+    def detect_anomalies(self, group_columns=("airport",), columns=DELAY_COLUMNS,
+                         z_threshold=3.5, iqr_multiplier=1.5):
+        """
+        Build baselines on the loaded data and return the rows flagged as anomalous.
+
+        Args:
+        - group_columns: Column(s) defining the peer groups
+        - columns: Numeric columns to score
+        - z_threshold: Robust z-score cut-off
+        - iqr_multiplier: IQR fence multiplier
+
+        Returns:
+        - DataFrame of flagged rows with their scores
+        """
+        self.build_baselines(group_columns, columns)
+        scores = self.score(columns=columns, z_threshold=z_threshold, iqr_multiplier=iqr_multiplier)
+        flagged = pd.concat([self.data, scores], axis=1)[scores["is_anomaly"].to_numpy()]
+        print(f"Flagged {len(flagged)} of {len(self.data)} rows as anomalous.")
+
+        self.save_to_output(f"anomalies_by_{'_'.join(self.group_columns)}.csv", flagged)
+        return flagged
+
+    def score_stream(self, source, chunk_size=100_000, z_threshold=3.5, iqr_multiplier=1.5):
+        """
+        Score new data chunk by chunk against the stored baselines.
+
+        Args:
+        - source: CSV file, directory of CSV files or glob, with the same columns as the dataset
+        - chunk_size: Rows read per chunk
+        - z_threshold: Robust z-score cut-off
+        - iqr_multiplier: IQR fence multiplier
+
+        Yields:
+        - DataFrame of the flagged rows of each chunk, with their scores
+        """
+        if self.baselines is None:
+            raise ValueError("No baselines available. Call build_baselines or load_baselines first.")
+        for chunk in iter_chunks(source, chunk_size=chunk_size):
+            scores = self.score(chunk, z_threshold=z_threshold, iqr_multiplier=iqr_multiplier)
+            yield pd.concat([chunk, scores], axis=1)[scores["is_anomaly"].to_numpy()]
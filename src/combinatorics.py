@@ -0,0 +1,360 @@
+#%% MODULE BEGINS
+# module_name = "combinatorics.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import math
+import operator
+
+# Third-Party Library Imports
+import numpy as np
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Ints above this size exceed Python's default 4300-digit str() limit
+MAX_EXACT_BITS = 14000
+# Exact multinomials estimated above this size are refused (use log_space=True)
+MAX_COMPUTE_BITS = 2 ** 23
+# Elements per (frequencies x primes) block in Legendre's formula
+EXACT_BLOCK_ELEMENTS = 2 ** 20
+
+
+class CombinatoricsEngine:
+    """
+    Exact and log-space combinatorics without full intermediate factorials.
+
+    Features:
+    - Exact permutations and combinations via multiplicative algorithms (math.perm / math.comb).
+    - Exact multinomial coefficients via prime exponents (Legendre's formula).
+    - Log-space results (natural log, via lgamma) when only the magnitude is needed.
+    - Memoizes repeated inputs.
+    """
+
+    def __init__(self):
+        """Initialize the engine with an empty result cache."""
+        self.cache = {}  # Cache keyed by (calculation, arguments, log_space)
+        self.log_factorials = np.zeros(1)  # log(k!) for k = 0..len-1, grown on demand
+
+    # --------------------
+    # Validation
+    # --------------------
+
+    @staticmethod
+    def _as_count(value, name):
+        """
+        Convert a value to a non-negative Python int.
+
+        Args:
+        - value: Integer-like value (Python or NumPy integer)
+        - name: Argument name used in error messages
+
+        Returns:
+        - Value as a Python int
+        """
+        try:
+            value = operator.index(value)
+        except TypeError:
+            raise ValueError(f"{name} must be an integer") from None
+        if value < 0:
+            raise ValueError(f"{name} must be a non-negative integer")
+        return value
+
+    def _memoize(self, key, compute):
+        """Return the cached result for key, computing and storing it on a miss."""
+        if key not in self.cache:
+            self.cache[key] = compute()
+        return self.cache[key]
+
+    # --------------------
+    # Counting
+    # --------------------
+
+    def permutation(self, n, r, log_space=False):
+        """
+        Number of permutations P(n, r) = n! / (n - r)!.
+
+        Args:
+        - n: Number of items
+        - r: Number of items selected
+        - log_space: Return the natural log of the result instead of the exact value
+
+        Returns:
+        - Exact int, or float natural log when log_space is True
+        """
+        n, r = self._as_count(n, "n"), self._as_count(r, "r")
+        if n < r:
+            raise ValueError("n must be greater than or equal to r")
+        if log_space:
+            return self._memoize(("permutation", n, r, True),
+                                 lambda: math.lgamma(n + 1) - math.lgamma(n - r + 1))
+        return self._memoize(("permutation", n, r, False), lambda: math.perm(n, r))
+
+    def combination(self, n, r, log_space=False):
+        """
+        Number of combinations C(n, r) = n! / (r! (n - r)!).
+
+        Args:
+        - n: Number of items
+        - r: Number of items selected
+        - log_space: Return the natural log of the result instead of the exact value
+
+        Returns:
+        - Exact int, or float natural log when log_space is True
+        """
+        n, r = self._as_count(n, "n"), self._as_count(r, "r")
+        if n < r:
+            raise ValueError("n must be greater than or equal to r")
+        if log_space:
+            return self._memoize(("combination", n, r, True),
+                                 lambda: math.lgamma(n + 1) - math.lgamma(r + 1) - math.lgamma(n - r + 1))
+        return self._memoize(("combination", n, r, False), lambda: math.comb(n, r))
+
+    def permutation_with_repetition(self, n, r, log_space=False):
+        """
+        Number of permutations with repetition n ** r.
+
+        Returns:
+        - Exact int, or float natural log when log_space is True
+        """
+        n, r = self._as_count(n, "n"), self._as_count(r, "r")
+        if log_space:
+            return self._memoize(("permutation_with_repetition", n, r, True),
+                                 lambda: r * math.log(n) if n > 0 else (0.0 if r == 0 else -math.inf))
+        return self._memoize(("permutation_with_repetition", n, r, False), lambda: n ** r)
+
+    def combination_with_repetition(self, n, r, log_space=False):
+        """
+        Number of combinations with repetition C(n + r - 1, r).
+
+        Returns:
+        - Exact int, or float natural log when log_space is True
+        """
+        n, r = self._as_count(n, "n"), self._as_count(r, "r")
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        return self.combination(n + r - 1, r, log_space=log_space)
+
+    def circular_permutation(self, n, log_space=False):
+        """
+        Number of circular permutations (n - 1)!.
+
+        Returns:
+        - Exact int, or float natural log when log_space is True
+        """
+        n = self._as_count(n, "n")
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        return self.permutation(n - 1, n - 1, log_space=log_space)
+
+    def multinomial(self, frequencies, log_space=False):
+        """
+        Number of distinct arrangements of items with repeated values,
+        N! / (f1! f2! ... fk!) where N = sum of frequencies.
+
+        The exact value is assembled from prime powers, so N! is never built. Its size
+        is estimated in log space first; results above MAX_COMPUTE_BITS are refused.
+
+        Args:
+        - frequencies: Iterable of non-negative integer frequencies
+        - log_space: Return the natural log of the result instead of the exact value
+
+        Returns:
+        - Exact int, or float natural log when log_space is True
+        """
+        counts = tuple(sorted(self._as_count(f, "frequency") for f in frequencies))
+        if log_space:
+            return self._memoize(("multinomial", counts, True),
+                                 lambda: math.lgamma(sum(counts) + 1) - sum(math.lgamma(f + 1) for f in counts))
+        bits = (math.lgamma(sum(counts) + 1) - sum(math.lgamma(f + 1) for f in counts)) / math.log(2)
+        if bits > MAX_COMPUTE_BITS:
+            raise ValueError(f"Exact multinomial would have about {bits:,.0f} bits; use log_space=True.")
+        return self._memoize(("multinomial", counts, False), lambda: self._multinomial_exact(counts))
+
+    # --------------------
+    # Batched (vectorized) counting
+    # --------------------
+
+    BATCH_CALCULATIONS = (
+        "permutation",
+        "combination",
+        "permutation_with_repetition",
+        "combination_with_repetition",
+    )
+
+    def log_factorial(self, values):
+        """
+        Vectorized log(k!) from a cached cumulative-log table.
+
+        Args:
+        - values: Array of non-negative integers
+
+        Returns:
+        - Float array of natural-log factorials
+        """
+        values = np.asarray(values, dtype=np.int64)
+        needed = int(values.max()) + 1 if values.size else 1
+        if needed > len(self.log_factorials):
+            # Grow geometrically so repeated batches reuse the table
+            size = max(needed, 2 * len(self.log_factorials))
+            self.log_factorials = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, size)))))
+        return self.log_factorials[values]
+
+    def batch(self, calculation_type, n_values, r_values, log_space=True):
+        """
+        Evaluate one calculation for arrays of n and r (broadcast against each other).
+
+        Pairs with r > n count zero arrangements for permutations and combinations
+        (log value -inf).
+
+        Args:
+        - calculation_type: One of BATCH_CALCULATIONS
+        - n_values: Array of n values
+        - r_values: Array of r values, broadcastable with n_values
+        - log_space: Return natural logs (vectorized) instead of exact ints
+
+        Returns:
+        - Float array of natural logs, or object array of exact ints
+        """
+        if calculation_type not in self.BATCH_CALCULATIONS:
+            raise ValueError(f"Unsupported calculation type '{calculation_type}'. "
+                             f"Use one of: {', '.join(self.BATCH_CALCULATIONS)}.")
+        n_values, r_values = np.broadcast_arrays(np.asarray(n_values), np.asarray(r_values))
+        if not (np.issubdtype(n_values.dtype, np.integer) and np.issubdtype(r_values.dtype, np.integer)):
+            raise ValueError("n and r must be integers")
+        if np.any(n_values < 0) or np.any(r_values < 0):
+            raise ValueError("n and r must be non-negative integers")
+        if calculation_type == "combination_with_repetition" and np.any(n_values < 1):
+            raise ValueError("n must be at least 1")
+
+        if not log_space:
+            return self._batch_exact(calculation_type, n_values, r_values)
+
+        n = n_values.astype(np.int64)
+        r = r_values.astype(np.int64)
+        if calculation_type == "permutation_with_repetition":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = r * np.log(n.astype(float))
+            result[(n == 0) & (r == 0)] = 0.0
+            return result
+        if calculation_type == "combination_with_repetition":
+            n = n + r - 1
+        valid = r <= n
+        safe_diff = np.where(valid, n - r, 0)
+        result = self.log_factorial(n) - self.log_factorial(safe_diff)
+        if calculation_type != "permutation":
+            result -= self.log_factorial(r)
+        return np.where(valid, result, -np.inf)
+
+    def _batch_exact(self, calculation_type, n_values, r_values):
+        """Exact batch results, reusing the memoized scalar methods."""
+        method = getattr(self, calculation_type)
+        result = np.empty(n_values.shape, dtype=object)
+        for index, (n, r) in enumerate(zip(n_values.ravel().tolist(), r_values.ravel().tolist())):
+            if calculation_type in ("permutation", "combination") and r > n:
+                result.flat[index] = 0
+            else:
+                result.flat[index] = method(n, r)
+        return result
+
+    # --------------------
+    # Prime-exponent helpers
+    # --------------------
+
+    @staticmethod
+    def _primes_up_to(n):
+        """Return all primes <= n as an int64 array (sieve of Eratosthenes)."""
+        if n < 2:
+            return np.array([], dtype=np.int64)
+        sieve = np.ones(n + 1, dtype=bool)
+        sieve[:2] = False
+        for p in range(2, math.isqrt(n) + 1):
+            if sieve[p]:
+                sieve[p * p::p] = False
+        return np.flatnonzero(sieve).astype(np.int64)
+
+    def _multinomial_exact(self, counts):
+        """
+        Exact multinomial coefficient from prime exponents.
+
+        By Legendre's formula the exponent of prime p in m! is sum_k floor(m / p^k),
+        so the exponent in N! / prod(f!) is the same sum taken over N minus the
+        frequencies, computed for all primes at once. Only primes up to the largest
+        frequency appear in the denominator; they are processed in blocks of
+        frequencies to bound memory.
+        """
+        total = sum(counts)
+        # Frequencies of 0 and 1 contribute 0! = 1! = 1 to the denominator
+        counts = np.array([f for f in counts if f > 1] or [0], dtype=np.int64)
+        max_count = counts.max()
+        primes = self._primes_up_to(total)
+        exponents = np.zeros(len(primes), dtype=np.int64)
+        power = primes.copy()
+        active = np.ones(len(primes), dtype=bool)
+        while active.any():
+            p = power[active]
+            exponents[active] += total // p
+            # Powers are increasing with the primes, so the contributing ones are a prefix
+            contributing = np.flatnonzero(active)[:np.searchsorted(p, max_count, side="right")]
+            block = max(1, EXACT_BLOCK_ELEMENTS // max(len(contributing), 1))
+            for start in range(0, len(counts), block):
+                exponents[contributing] -= (counts[start:start + block, None]
+                                            // power[contributing][None, :]).sum(axis=0)
+            # Stop once p^k exceeds N (also guards against int64 overflow)
+            still = p <= total // primes[active]
+            power[np.flatnonzero(active)[still]] *= primes[active][still]
+            active[np.flatnonzero(active)[~still]] = False
+        nonzero = exponents > 0
+        factors = [pow(int(p), int(e)) for p, e in zip(primes[nonzero], exponents[nonzero])]
+        return self._product(factors)
+
+    @staticmethod
+    def _product(factors):
+        """Multiply big integers pairwise (product tree) to keep operands balanced."""
+        if not factors:
+            return 1
+        while len(factors) > 1:
+            paired = [a * b for a, b in zip(factors[0::2], factors[1::2])]
+            if len(factors) % 2:
+                paired.append(factors[-1])
+            factors = paired
+        return factors[0]
+
+    # --------------------
+    # Formatting
+    # --------------------
+
+    @classmethod
+    def format_result(cls, value):
+        """
+        Convert a result to a value that can be written to a table.
+
+        Exact ints too long for Python's int-to-str limit are written as their
+        scientific-notation magnitude; the exact value is still returned to callers.
+
+        Args:
+        - value: Exact int or log-space float
+
+        Returns:
+        - The value itself, or a '~mantissa e exponent' string for huge ints
+        """
+        if isinstance(value, int) and value.bit_length() > MAX_EXACT_BITS:
+            return "~" + cls.format_log_value(math.log(value))
+        return value
+
+    @staticmethod
+    def format_log_value(log_value):
+        """
+        Format a natural-log magnitude as scientific notation, e.g. '1.234e+5678'.
+
+        Args:
+        - log_value: Natural log of a positive number
+
+        Returns:
+        - String representation of the magnitude
+        """
+        if math.isinf(log_value):
+            return "0" if log_value < 0 else "inf"
+        log10_value = log_value / math.log(10)
+        exponent = math.floor(log10_value)
+        mantissa = 10 ** (log10_value - exponent)
+        return f"{mantissa:.3f}e{exponent:+d}"
@@ -4,10 +4,20 @@ from pathlib import Path
 # Get the absolute path to the src directory
 SRC_DIR = Path(__file__).parent
 
-# Go up one level to the project root and then into the data directory
+# Go up one level to the project root and then into the data directory.
+# DATA_PATH may also be a directory of CSV files or a glob (e.g. 'Input/airline_delay_*.csv').
 DATA_PATH = os.path.abspath(os.path.join(SRC_DIR.parent, 'Input', 'airline_delay_2023.csv'))
 OUTPUT_FOLDER = os.path.abspath(os.path.join(SRC_DIR.parent, 'Output'))
 
+# Source columns read at startup by the menu and the analysis service (column projection).
+# 'airport_name' is display-only and is not read; derived metrics are computed from these.
+ANALYSIS_COLUMNS = [
+    "year", "month", "carrier", "carrier_name", "airport",
+    "arr_flights", "arr_del15", "carrier_ct", "weather_ct", "nas_ct", "security_ct", "late_aircraft_ct",
+    "arr_cancelled", "arr_diverted", "arr_delay",
+    "carrier_delay", "weather_delay", "nas_delay", "security_delay", "late_aircraft_delay"
+]
+
 # Default columns
 # This is now accessed through data_management(parent) class.
 # DEFAULT_COLUMNS = [
@@ -19,29 +29,36 @@ OUTPUT_FOLDER = os.path.abspath(os.path.join(SRC_DIR.parent, 'Output'))
 #     "security_delay",
 #     "late_aircraft_delay"
 # ]
-#  # Region mapping for Different Airports
-# region_mapping = {
-#     "Northeast": [
-#         "JFK", "LGA", "BOS", "PVD", "BDL", "ALB", "SYR", "ROC", "BGM", "BUF",
-#         "HPN", "ABE", "EWR", "SWF", "PWM", "BTV", "MVY", "ACK", "HYA"
-#     ],
-#     "Midwest": [
-#         "ORD", "MDW", "CLE", "CMH", "DAY", "CVG", "IND", "DTW", "GRR", "LAN",
-#         "MBS", "MSP", "DSM", "CID", "STL", "MCI", "OMA", "FAR", "GFK", "FSD",
-#         "BIS", "MOT", "XWA"
-#     ],
-#     "South": [
-#         "ATL", "CLT", "RDU", "IAD", "DCA", "BWI", "ORF", "RIC", "CHS", "SAV",
-#         "JAX", "MCO", "TPA", "FLL", "MIA", "PBI", "MEM", "BNA", "HSV", "BHM",
-#         "MOB", "MSY", "DAL", "DFW", "IAH", "HOU", "OKC", "TUL", "SAT", "AUS",
-#         "CRW", "SHV", "MGM", "GSP"
-#     ],
-#     "West": [
-#         "LAX", "SFO", "SAN", "SJC", "BUR", "ONT", "SMF", "RNO", "LAS", "PHX",
-#         "TUS", "SEA", "PDX", "BOI", "DEN", "COS", "SLC", "GEG", "MSO", "BZN",
-#         "FCA", "HLN", "BIL", "RDM"
-#     ],
-#     "Alaska": ["ANC", "FAI", "JNU", "KTN", "SIT", "ADK", "BET", "BRW", "CDV", "OTZ", "OME", "SCC", "WRG", "GST", "YAK"],
-#     "Pacific Territories": ["GUM", "SPN", "PPG"],
-#     "Other": []  
-# }
\ No newline at end of file
+
+# Region mapping for Different Airports (shared by DataHandler and the calculators)
+REGION_MAPPING = {
+    "Northeast": [
+        "JFK", "LGA", "BOS", "PVD", "BDL", "ALB", "SYR", "ROC", "BGM", "BUF",
+        "HPN", "ABE", "EWR", "SWF", "PWM", "BTV", "MVY", "ACK", "HYA"
+    ],
+    "Midwest": [
+        "ORD", "MDW", "CLE", "CMH", "DAY", "CVG", "IND", "DTW", "GRR", "LAN",
+        "MBS", "MSP", "DSM", "CID", "STL", "MCI", "OMA", "FAR", "GFK", "FSD",
+        "BIS", "MOT", "XWA"
+    ],
+    "South": [
+        "ATL", "CLT", "RDU", "IAD", "DCA", "BWI", "ORF", "RIC", "CHS", "SAV",
+        "JAX", "MCO", "TPA", "FLL", "MIA", "PBI", "MEM", "BNA", "HSV", "BHM",
+        "MOB", "MSY", "DAL", "DFW", "IAH", "HOU", "OKC", "TUL", "SAT", "AUS",
+        "CRW", "SHV", "MGM", "GSP"
+    ],
+    "West": [
+        "LAX", "SFO", "SAN", "SJC", "BUR", "ONT", "SMF", "RNO", "LAS", "PHX",
+        "TUS", "SEA", "PDX", "BOI", "DEN", "COS", "SLC", "GEG", "MSO", "BZN",
+        "FCA", "HLN", "BIL", "RDM"
+    ],
+    "Alaska": ["ANC", "FAI", "JNU", "KTN", "SIT", "ADK", "BET", "BRW", "CDV", "OTZ", "OME", "SCC", "WRG", "GST", "YAK"],
+    "Pacific Territories": ["GUM", "SPN", "PPG"],
+    "Other": []  
+}
+# Airport code -> region lookup built once from REGION_MAPPING
+AIRPORT_TO_REGION = {
+    airport: region
+    for region, airports in REGION_MAPPING.items()
+    for airport in airports
+}
@@ -5,68 +5,189 @@
 
 # Standard Library Imports
 import os
-from pathlib import Path
 
 # Third-Party Library Imports
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# Relative Imports
+from .config import DATA_PATH, REGION_MAPPING
+from .query_cache import QueryCache
+from .derived_metrics import DerivedMetricRegistry
+from .data_loader import load_files
+from .quantile_sketch import dataset_fingerprint
+from .plot_cache import PlotCache, show_image
+from .histogram_engine import HistogramEngine
+from .frequency_engine import FrequencyEngine
+from .data_validator import DatasetValidator
+
 
 class DataHandler:
+    DEFAULT_COLUMNS = [
+        "carrier_name", 
+        "arr_delay",
+        "carrier_delay",
+        "weather_delay",
+        "nas_delay",
+        "security_delay",
+        "late_aircraft_delay"
+    ]
+
+    # Columns each operation reads besides the ones passed to it; used for column projection
+    OPERATION_COLUMNS = {
+        "visualize_delays": DEFAULT_COLUMNS,
+        "query_arrival_delays_by_carrier": ["carrier_name", "arr_delay"],
+        "categorize_airports": ["airport"],
+    }
+
     def __init__(self):
         """Initialize DataHandler with built-in configuration."""
-        # Get the absolute path to the src directory
-        SRC_DIR = Path(__file__).parent
-        
-        # Go up one level to the project root and then into the data directory
-        self.DATA_PATH = os.path.abspath(os.path.join(SRC_DIR.parent, 'Input', 'airline_delay_2023.csv'))
-        
-        self.DEFAULT_COLUMNS = [
-            "carrier_name", 
-            "arr_delay",
-            "carrier_delay",
-            "weather_delay",
-            "nas_delay",
-            "security_delay",
-            "late_aircraft_delay"
-        ]
+        # Data source from config (a file, a directory of CSV files or a glob)
+        self.DATA_PATH = DATA_PATH
         
-        self.region_mapping = {
-            "Northeast": [
-                "JFK", "LGA", "BOS", "PVD", "BDL", "ALB", "SYR", "ROC", "BGM", "BUF",
-                "HPN", "ABE", "EWR", "SWF", "PWM", "BTV", "MVY", "ACK", "HYA"
-            ],
-            "Midwest": [
-                "ORD", "MDW", "CLE", "CMH", "DAY", "CVG", "IND", "DTW", "GRR", "LAN",
-                "MBS", "MSP", "DSM", "CID", "STL", "MCI", "OMA", "FAR", "GFK", "FSD",
-                "BIS", "MOT", "XWA"
-            ],
-            "South": [
-                "ATL", "CLT", "RDU", "IAD", "DCA", "BWI", "ORF", "RIC", "CHS", "SAV",
-                "JAX", "MCO", "TPA", "FLL", "MIA", "PBI", "MEM", "BNA", "HSV", "BHM",
-                "MOB", "MSY", "DAL", "DFW", "IAH", "HOU", "OKC", "TUL", "SAT", "AUS",
-                "CRW", "SHV", "MGM", "GSP"
-            ],
-            "West": [
-                "LAX", "SFO", "SAN", "SJC", "BUR", "ONT", "SMF", "RNO", "LAS", "PHX",
-                "TUS", "SEA", "PDX", "BOI", "DEN", "COS", "SLC", "GEG", "MSO", "BZN",
-                "FCA", "HLN", "BIL", "RDM"
-            ],
-            "Alaska": [
-                "ANC", "FAI", "JNU", "KTN", "SIT", "ADK", "BET", "BRW", "CDV", 
-                "OTZ", "OME", "SCC", "WRG", "GST", "YAK"
-            ],
-            "Pacific Territories": ["GUM", "SPN", "PPG"],
-            "Other": []  
-        }
+        self.region_mapping = REGION_MAPPING
         
+        self.data_version = 0  # Incremented whenever data_df is replaced
+        self.load_timings = None  # Per-file parse times of the last load
+        self.loaded_columns = None  # Projected columns of the last load; None when all were read
+        self.validator = DatasetValidator()
+        self.validation_report = None  # Consistency check of the last load
+        self.query_cache = QueryCache()
+        self.derived_metrics = DerivedMetricRegistry()
+        self.output_folder = "Output"
+        self.plot_cache = PlotCache(self.output_folder)
+        self.pending_plot_keys = {}  # plot name -> cache key of a plot being rendered
+        self.last_plot_file = None  # Path of the most recently saved or cached plot
         self.data_df = None
 
-    def load_data(self):
-        """Load data from the built-in path."""
+    @property
+    def data_df(self):
+        """The loaded dataset."""
+        return self._data_df
+
+    @data_df.setter
+    def data_df(self, value):
+        # A new dataset invalidates every cached result keyed by the old version
+        self._data_df = value
+        self.data_version += 1
+        if value is not None:
+            self.derived_metrics.touch(value)
+        self.histogram_engine = None
+        self.frequency_engine = None
+        # Fingerprint the columns as loaded; derived columns added later are deterministic
+        self._source_columns = None if value is None else value.attrs.get("source_columns", list(value.columns))
+        self._data_fingerprint = None
+
+    def get_histogram_engine(self):
+        """Return the histogram engine of the loaded dataset (bins and counts are cached)."""
+        if self.histogram_engine is None:
+            self.histogram_engine = HistogramEngine(self.data_df)
+        return self.histogram_engine
+
+    def get_frequency_engine(self):
+        """Return the frequency engine of the loaded dataset (encoded counts are cached)."""
+        if self.frequency_engine is None:
+            self.frequency_engine = FrequencyEngine(self.data_df)
+        return self.frequency_engine
+
+    @property
+    def data_fingerprint(self):
+        """Content fingerprint of the loaded dataset, computed once per version."""
+        if self._data_fingerprint is None:
+            columns = [column for column in self._source_columns if column in self.data_df.columns]
+            self._data_fingerprint = dataset_fingerprint(self.data_df[columns])
+        return self._data_fingerprint
+
+    def fetch_cached_plot(self, plot_name, plot_type, **params):
+        """
+        Serve a plot from the plot cache if an identical one was rendered before.
+
+        On a hit the cached image is copied to the output folder and, with an
+        interactive backend, displayed in place of the skipped render.
+
+        On a miss the cache key is remembered, so save_plot() adds the new render.
+
+        Returns:
+        - True if the image was served from the cache and rendering can be skipped
+        """
+        key = self.plot_cache.make_key(plot_type, params, self.data_fingerprint)
+        output_file = os.path.join(self.output_folder, f"{plot_name}.png")
+        if self.plot_cache.fetch(key, output_file):
+            print(f"Plot loaded from cache as {output_file}")
+            self.last_plot_file = output_file
+            # Rendering is skipped, but interactive users still see the plot
+            show_image(output_file)
+            return True
+        self.pending_plot_keys[plot_name] = key
+        return False
+
+    def has_column(self, column_name):
+        """
+        Check for a column, adding it from the derived metric registry if it is registered.
+
+        Raises ValueError if the column exists in the input but was projected away at load.
+        """
+        if column_name in self.data_df.columns:
+            return True
+        if column_name not in self.derived_metrics:
+            if self.loaded_columns is not None:
+                raise ValueError(f"Column '{column_name}' was not loaded; include it in load_data(columns=...).")
+            return False
+        try:
+            self.derived_metrics.materialize(self.data_df, [column_name])
+        except KeyError as e:
+            print(f"Cannot compute derived column '{column_name}': {e}")
+            return False
+        return True
+
+    def invalidate_column(self, column_name):
+        """Mark a column as changed: drop dependent derived columns and cached query results."""
+        self.histogram_engine = None
+        self.frequency_engine = None
+        # Plot cache keys hash the content, so they must see the edit
+        self._data_fingerprint = None
+        for name in self.derived_metrics.invalidate(column_name, self.data_df):
+            if name in self.data_df.columns:
+                del self.data_df[name]
+            self.query_cache.invalidate_column(name)
+        self.query_cache.invalidate_column(column_name)
+
+    def columns_for(self, operations=(), columns=()):
+        """
+        Union of the columns needed by operations and by explicitly named columns.
+
+        Args:
+        - operations: Method names listed in OPERATION_COLUMNS (e.g. 'visualize_delays')
+        - columns: Columns passed to the operations (e.g. 'arr_delay', 'delay_rate')
+
+        Returns:
+        - List of source columns to pass to load_data(columns=...)
+        """
+        needed = []
+        for operation in operations:
+            if operation not in self.OPERATION_COLUMNS:
+                raise KeyError(f"Operation '{operation}' does not declare its columns.")
+            needed.extend(self.OPERATION_COLUMNS[operation])
+        return self.derived_metrics.expand(list(needed) + list(columns))
+
+    def load_data(self, columns=None, filters=None):
+        """
+        Load data from the built-in path (a file, a directory of CSV files or a glob pattern).
+
+        Args:
+        - columns: Optional columns to read, e.g. from columns_for(); all columns when None
+        - filters: Optional row filters applied while the input is streamed, so only
+          matching rows are materialized, e.g. {"carrier": "DL", "month": (7, 9)}
+        """
         try:
-            self.data_df = pd.read_csv(self.DATA_PATH)
+            self.loaded_columns = None if columns is None else self.derived_metrics.expand(columns)
+            self.data_df, self.load_timings = load_files(self.DATA_PATH, columns=self.loaded_columns,
+                                                         filters=filters)
             print(f"Data loaded successfully from {self.DATA_PATH}")
+            if len(self.load_timings) > 1:
+                print(self.load_timings.to_string(index=False))
+            self.validation_report = self.validator.validate(self.data_df)
+            print(self.validator.summarize(self.validation_report))
         except FileNotFoundError:
             print(f"Error: File not found at {self.DATA_PATH}")
             self.data_df = pd.DataFrame()
@@ -90,10 +211,13 @@ class DataHandler:
             'late_aircraft_delay': 'brown',
         }
 
+        if self.fetch_cached_plot("average_delays_by_carrier", "delays_by_carrier", colors=delay_columns):
+            return
+
         plt.figure(figsize=(15, 8))
         for column, color in delay_columns.items():
             if column in self.data_df.columns:
-                avg_delays = self.data_df.groupby('carrier_name')[column].mean().sort_values(ascending=False)
+                avg_delays = self.data_df.groupby('carrier_name', observed=True)[column].mean().sort_values(ascending=False)
                 plt.plot(range(len(avg_delays)),
                          avg_delays,
                          marker='o',
@@ -105,7 +229,7 @@ class DataHandler:
         plt.title('Average Delays by Carrier and Delay Type')
         plt.xlabel('Carrier')
         plt.ylabel('Average Delay (minutes)')
-        carriers = self.data_df.groupby('carrier_name')['arr_delay'].mean().sort_values(ascending=False).index
+        carriers = self.data_df.groupby('carrier_name', observed=True)['arr_delay'].mean().sort_values(ascending=False).index
         plt.xticks(range(len(carriers)), carriers, rotation=45, ha='right')
         plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
         plt.grid(True, linestyle='--', alpha=0.7)
@@ -115,19 +239,30 @@ class DataHandler:
         plt.show()
         plt.close()
 
-    def visualize_delay_histogram(self, column):
-        """Create a histogram for the specified delay column."""
+    def visualize_delay_histogram(self, column, bins=30, strategy="fixed"):
+        """
+        Create a histogram for the specified delay column.
+
+        Counts come from the histogram engine; strategy is 'fixed', 'log' or 'quantile'.
+        """
         if self.data_df is not None:
-            if column in self.data_df.columns:
+            if self.has_column(column):
+                plot_name = f"histogram_{column}" if strategy == "fixed" else f"histogram_{column}_{strategy}"
+                if self.fetch_cached_plot(plot_name, "histogram", column=column, bins=bins, strategy=strategy):
+                    return
+                histogram = self.get_histogram_engine().compute(column, bins, strategy)[column]
+                edges = histogram["edges"]
                 plt.figure(figsize=(10, 6))
-                self.data_df[column].dropna().plot(kind='hist', bins=30, color='skyblue', edgecolor='black')
+                plt.hist(edges[:-1], bins=edges, weights=histogram["counts"], color='skyblue', edgecolor='black')
+                if strategy == "log":
+                    plt.xscale('symlog')
                 plt.title(f'Distribution of {column}')
                 plt.xlabel(column)
                 plt.ylabel('Frequency')
                 plt.grid(True)
                 plt.tight_layout()
                 
-                self.save_plot(f"histogram_{column}")
+                self.save_plot(plot_name)
                 plt.show()
                 plt.close()
             else:
@@ -135,23 +270,56 @@ class DataHandler:
         else:
             print("Data not loaded. Please load the data first.")
 
-    def visualize_column(self, column_name):
-        """Visualize frequency distribution of a column."""
-        if self.data_df is None or self.data_df.empty:
-            print("Error: No data loaded to visualize.")
-            return
+    def visualize_column(self, column_name, top_k=20, streaming=False):
+        """
+        Visualize frequency distribution of a column.
 
-        if column_name not in self.data_df.columns:
-            print(f"Column '{column_name}' not found in the dataset.")
-            return
+        Categorical columns with more than top_k values show the top_k most frequent
+        values and an 'Other' bucket.
+
+        With streaming=True the input files are read chunk by chunk and the top_k values
+        come from a heavy-hitters sketch, so the column need not be loaded; counts are
+        lower bounds within the error shown in the title.
+        """
+        if streaming:
+            try:
+                value_counts, error_bound = FrequencyEngine().stream_top_k(self.DATA_PATH, column_name, top_k)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Error: {e}")
+                return
+            # Not plot-cached: the cache key fingerprints the loaded data, not the input files
+            plot_name = f"{column_name}_frequency_plot_streamed"
+            title = f"Frequency of {column_name} (Top {top_k}, streamed; counts within {error_bound:.0f})"
+            dtype = None
+        else:
+            if self.data_df is None or self.data_df.empty:
+                print("Error: No data loaded to visualize.")
+                return
+
+            if not self.has_column(column_name):
+                print(f"Column '{column_name}' not found in the dataset.")
+                return
+
+            plot_name = f"{column_name}_frequency_plot"
+            if self.fetch_cached_plot(plot_name, "frequency", column=column_name, top_k=top_k):
+                return
+
+            dtype = self.data_df[column_name].dtype
+            if dtype == 'object' or dtype.name == 'category':
+                engine = self.get_frequency_engine()
+                labels, counts = engine.counts(column_name)
+                if len(counts) > top_k:
+                    value_counts = engine.top_k(column_name, top_k)
+                    title = f"Frequency of {column_name} (Top {top_k} + Other, Line Plot)"
+                else:
+                    value_counts = pd.Series(counts, index=labels).sort_index()
+                    title = f"Frequency of {column_name} (Line Plot)"
 
-        data = self.data_df[column_name].dropna()
         plt.figure(figsize=(15, 8))
 
-        if data.dtype == 'object' or data.dtype.name == 'category':
-            value_counts = data.value_counts().sort_index()
+        if dtype is None or dtype == 'object' or dtype.name == 'category':
             ax = value_counts.plot(kind="line", marker="o", color="skyblue", linewidth=2)
-            plt.title(f"Frequency of {column_name} (Line Plot)")
+            plt.title(title)
             plt.xlabel(column_name)
             plt.ylabel("Frequency")
             plt.xticks(range(len(value_counts)), value_counts.index, rotation=45, ha='right')
@@ -160,7 +328,8 @@ class DataHandler:
             for i, v in enumerate(value_counts):
                 ax.text(i, v, str(v), ha='center', va='bottom')
         else:
-            data.value_counts().sort_index().plot(kind="line", marker="o", color="skyblue", linewidth=2)
+            self.data_df[column_name].dropna().value_counts().sort_index().plot(
+                kind="line", marker="o", color="skyblue", linewidth=2)
             plt.title(f"Frequency of {column_name} (Line Plot)")
             plt.xlabel(column_name)
             plt.ylabel("Frequency")
@@ -168,7 +337,7 @@ class DataHandler:
             plt.grid(True, linestyle='--', alpha=0.7)
 
         plt.tight_layout()
-        self.save_plot(f"{column_name}_frequency_plot")
+        self.save_plot(plot_name)
         plt.show()
         plt.close()
 
@@ -188,11 +357,16 @@ class DataHandler:
         print(f"The total number of recorded arrival delays for '{carrier_name}' is: {total_delays}")
 
     def save_plot(self, plot_name):
-        """Helper method to save plots in the Output directory."""
-        output_folder = "Output"
-        if not os.path.exists(output_folder):
-            os.makedirs(output_folder)
+        """Helper method to save plots in the output folder; returns the file path."""
+        if not os.path.exists(self.output_folder):
+            os.makedirs(self.output_folder)
 
-        output_file = os.path.join(output_folder, f"{plot_name}.png")
+        output_file = os.path.join(self.output_folder, f"{plot_name}.png")
         plt.savefig(output_file)
-        print(f"Plot saved as {output_file}")
\ No newline at end of file
+        print(f"Plot saved as {output_file}")
+        self.last_plot_file = output_file
+
+        key = self.pending_plot_keys.pop(plot_name, None)
+        if key is not None:
+            self.plot_cache.store(key, output_file)
+        return output_file
\ No newline at end of file
@@ -4,18 +4,38 @@
 #%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 # Standard Library Imports
+import operator
 import os
 
 # Third-Party Library Imports
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import numpy as np
 
 # Relative Imports
 from .data_management import DataHandler
 
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+QUERY_OPERATORS = {
+    '>': operator.gt,
+    '<': operator.lt,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>=': operator.ge,
+    '<=': operator.le,
+}
+
 
 class DataVisualizer(DataHandler):
+    # Plots by region need the airport codes
+    OPERATION_COLUMNS = {
+        **DataHandler.OPERATION_COLUMNS,
+        "plot_violin": ["airport"],
+        "plot_box": ["airport"],
+        "plot_scatter": ["airport"],
+    }
+
     def __init__(self):
         """Initialize DataVisualizer with parent's configuration."""
         super().__init__()
@@ -34,6 +54,7 @@ class DataVisualizer(DataHandler):
         
         if 'airport' in self.data_df.columns:
             self.data_df['region'] = self.data_df['airport'].map(airport_to_region).fillna('Other')
+            self.invalidate_column('region')
         else:
             print("Column 'airport' not found in the dataset.")
     
@@ -46,10 +67,13 @@ class DataVisualizer(DataHandler):
         if 'region' not in self.data_df.columns:
             self.categorize_airports()
         
-        if column_name not in self.data_df.columns:
+        if not self.has_column(column_name):
             print(f"Column '{column_name}' not found in the dataset.")
             return
 
+        if self.fetch_cached_plot(f"violin_{column_name}", "violin", column=column_name):
+            return
+
         plt.figure(figsize=(14, 8))
         sns.violinplot(data=self.data_df, x='region', y=column_name, palette="muted")
         plt.title(f"Violin Plot of {column_name} by Region")
@@ -70,10 +94,13 @@ class DataVisualizer(DataHandler):
         if 'region' not in self.data_df.columns:
             self.categorize_airports()
         
-        if column_name not in self.data_df.columns:
+        if not self.has_column(column_name):
             print(f"Column '{column_name}' not found in the dataset.")
             return
 
+        if self.fetch_cached_plot(f"box_{column_name}", "box", column=column_name):
+            return
+
         plt.figure(figsize=(12, 6))
         sns.boxplot(data=self.data_df, x='region', y=column_name, palette="muted")
         plt.title(f"Box Plot of {column_name} by Region")
@@ -91,13 +118,16 @@ class DataVisualizer(DataHandler):
             print("Error: No data loaded to visualize.")
             return
 
-        if x_column not in self.data_df.columns or y_column not in self.data_df.columns:
+        if not self.has_column(x_column) or not self.has_column(y_column):
             print(f"Columns '{x_column}' or '{y_column}' not found in the dataset.")
             return
 
         if 'region' not in self.data_df.columns:
             self.categorize_airports()
 
+        if self.fetch_cached_plot(f"scatter_{x_column}_vs_{y_column}", "scatter", x=x_column, y=y_column):
+            return
+
         plt.figure(figsize=(14, 8))
         sns.scatterplot(data=self.data_df, x=x_column, y=y_column, hue="region", palette="tab10")
         plt.title(f"Scatter Plot of {x_column} vs {y_column}")
@@ -117,30 +147,34 @@ class DataVisualizer(DataHandler):
             print("Error: No data loaded to query.")
             return pd.DataFrame()
 
-        if column_name not in self.data_df.columns:
+        if not self.has_column(column_name):
             print(f"Column '{column_name}' not found in the dataset.")
             return pd.DataFrame()
 
+        if condition not in QUERY_OPERATORS:
+            print(f"Unsupported condition '{condition}'. Please use one of: '>', '<', '==', '!=', '>=', '<='.")
+            return pd.DataFrame()
+
+        # Cached results are row positions keyed by predicate and dataset version
+        key = self.query_cache.make_key(self.data_version, column_name, condition, value)
+        status, rows = self.query_cache.lookup(key)
         try:
-            if condition == '>':
-                result_df = self.data_df[self.data_df[column_name] > value]
-            elif condition == '<':
-                result_df = self.data_df[self.data_df[column_name] < value]
-            elif condition == '==':
-                result_df = self.data_df[self.data_df[column_name] == value]
-            elif condition == '!=':
-                result_df = self.data_df[self.data_df[column_name] != value]
-            elif condition == '>=':
-                result_df = self.data_df[self.data_df[column_name] >= value]
-            elif condition == '<=':
-                result_df = self.data_df[self.data_df[column_name] <= value]
-            else:
-                print(f"Unsupported condition '{condition}'. Please use one of: '>', '<', '==', '!=', '>=', '<='.")
-                return pd.DataFrame()
+            if status == "refine":
+                # Only the rows of a cached superset need to be tested
+                candidates = self.data_df[column_name].iloc[rows]
+                rows = rows[QUERY_OPERATORS[condition](candidates, value).to_numpy()]
+            elif status == "miss":
+                mask = QUERY_OPERATORS[condition](self.data_df[column_name], value).to_numpy()
+                # 32-bit positions halve the cache footprint on all realistic sizes
+                rows = np.flatnonzero(mask).astype(np.int32 if len(mask) < 2**31 else np.int64)
         except Exception as e:
             print(f"Error applying condition: {e}")
             return pd.DataFrame()
 
+        if status != "hit":
+            self.query_cache.put(key, rows)
+        result_df = self.data_df.iloc[rows]
+
         if result_df.empty:
             print("No data matched the query.")
         else:
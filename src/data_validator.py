@@ -0,0 +1,165 @@
+#%% MODULE BEGINS
+# module_name = "data_validator.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Third-Party Library Imports
+import numpy as np
+import pandas as pd
+
+# Relative Imports
+from .derived_metrics import CAUSE_COLUMNS
+from .data_loader import iter_chunks
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+COUNT_COLUMNS = ("carrier_ct", "weather_ct", "nas_ct", "security_ct", "late_aircraft_ct")
+DELAY_TOLERANCE = 0.5  # Minutes; delay columns are whole minutes
+COUNT_TOLERANCE = 0.05  # Cause counts are fractional and rounded to two decimals
+
+
+#%% FUNCTION DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def _matrix(frame, columns):
+    return frame[list(columns)].to_numpy(dtype=float)
+
+
+def check_cause_delays(frame, tolerance=DELAY_TOLERANCE):
+    """Cause delays must add up to arr_delay. Returns (checked, violated) row masks."""
+    causes = _matrix(frame, CAUSE_COLUMNS)
+    total = frame["arr_delay"].to_numpy(dtype=float)
+    checked = ~np.isnan(causes).any(axis=1) & ~np.isnan(total)
+    return checked, checked & (np.abs(causes.sum(axis=1) - total) > tolerance)
+
+
+def check_cause_counts(frame, tolerance=COUNT_TOLERANCE):
+    """Cause counts (*_ct) must add up to arr_del15. Returns (checked, violated) row masks."""
+    counts = _matrix(frame, COUNT_COLUMNS)
+    total = frame["arr_del15"].to_numpy(dtype=float)
+    checked = ~np.isnan(counts).any(axis=1) & ~np.isnan(total)
+    return checked, checked & (np.abs(counts.sum(axis=1) - total) > tolerance)
+
+
+def check_delayed_flights(frame, tolerance=0.0):
+    """arr_del15 must not exceed arr_flights. Returns (checked, violated) row masks."""
+    delayed = frame["arr_del15"].to_numpy(dtype=float)
+    flights = frame["arr_flights"].to_numpy(dtype=float)
+    checked = ~np.isnan(delayed) & ~np.isnan(flights)
+    return checked, checked & (delayed > flights + tolerance)
+
+
+def default_rules():
+    """
+    Built-in BTS invariants as dicts with name, description, columns, check and tolerance.
+    """
+    return [
+        {"name": "cause_delays_sum_to_arr_delay",
+         "description": "carrier + weather + nas + security + late_aircraft delay == arr_delay",
+         "columns": CAUSE_COLUMNS + ("arr_delay",), "check": check_cause_delays, "tolerance": DELAY_TOLERANCE},
+        {"name": "cause_counts_sum_to_arr_del15",
+         "description": "sum of *_ct counts == arr_del15",
+         "columns": COUNT_COLUMNS + ("arr_del15",), "check": check_cause_counts, "tolerance": COUNT_TOLERANCE},
+        {"name": "arr_del15_le_arr_flights",
+         "description": "arr_del15 <= arr_flights",
+         "columns": ("arr_del15", "arr_flights"), "check": check_delayed_flights, "tolerance": 0.0},
+    ]
+
+
+#%% CLASS DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class DatasetValidator:
+    """
+    Vectorized consistency checks of the dataset's internal invariants.
+
+    Features:
+    - Every rule is a whole-column NumPy expression; all rules run in one pass.
+    - Reports rows checked, violation counts and a sample of violating row indexes.
+    - Accumulates over chunks (update), so a file can be validated while streaming.
+    - Rules whose columns are missing (e.g. after column projection) are skipped.
+    """
+
+    def __init__(self, rules=None, sample_size=10):
+        """
+        Initialize the validator.
+
+        Args:
+        - rules: List of rule dicts (see default_rules); defaults to the BTS invariants
+        - sample_size: Number of violating row indexes kept per rule
+        """
+        self.rules = default_rules() if rules is None else rules
+        self.sample_size = sample_size
+        self.reset()
+
+    def reset(self):
+        """Clear accumulated results."""
+        self.results = {rule["name"]: {"checked": 0, "violations": 0, "samples": [], "skipped": False}
+                        for rule in self.rules}
+
+    def update(self, frame, row_offset=0):
+        """
+        Check a frame (or chunk) and add its results.
+
+        Args:
+        - frame: DataFrame to check
+        - row_offset: Position of the frame's first row in the whole dataset
+        """
+        for rule in self.rules:
+            result = self.results[rule["name"]]
+            if any(column not in frame.columns for column in rule["columns"]):
+                result["skipped"] = True
+                continue
+            checked, violated = rule["check"](frame, rule["tolerance"])
+            result["checked"] += int(checked.sum())
+            result["violations"] += int(violated.sum())
+            room = self.sample_size - len(result["samples"])
+            if room > 0:
+                result["samples"].extend((np.flatnonzero(violated)[:room] + row_offset).tolist())
+        return self
+
+    def report(self):
+        """
+        Return the accumulated results.
+
+        Returns:
+        - DataFrame with Rule, Description, Rows Checked, Violations and Sample Rows
+          (row positions in the dataset)
+        """
+        return pd.DataFrame([{
+            "Rule": rule["name"],
+            "Description": rule["description"],
+            "Rows Checked": self.results[rule["name"]]["checked"],
+            "Violations": self.results[rule["name"]]["violations"],
+            "Sample Rows": self.results[rule["name"]]["samples"],
+            "Skipped": self.results[rule["name"]]["skipped"],
+        } for rule in self.rules])
+
+    def validate(self, frame):
+        """Check a whole DataFrame in one pass and return the report."""
+        self.reset()
+        return self.update(frame).report()
+
+    def validate_stream(self, source, chunk_size=100_000):
+        """
+        Check input files chunk by chunk (only the rule columns are read) and return the report.
+
+        Args:
+        - source: Path to a CSV file, a directory of CSV files or a glob pattern
+        - chunk_size: Rows read per chunk
+        """
+        self.reset()
+        columns = {column for rule in self.rules for column in rule["columns"]}
+        for chunk in iter_chunks(source, columns=columns, chunk_size=chunk_size):
+            # Chunks are indexed by position across files (empty for header-only files)
+            self.update(chunk, chunk.index.start)
+        return self.report()
+
+    @staticmethod
+    def summarize(report):
+        """One-line summary of a report, listing rules with violations."""
+        failing = report[report["Violations"] > 0]
+        checked = int((~report["Skipped"]).sum())
+        if checked == 0:
+            return "Consistency check skipped (rule columns not loaded)."
+        if failing.empty:
+            return f"Consistency check passed ({checked} rules)."
+        details = "; ".join(f"{row['Rule']}: {row['Violations']} rows (e.g. {row['Sample Rows'][:3]})"
+                            for _, row in failing.iterrows())
+        return f"Consistency check found violations - {details}"
@@ -0,0 +1,248 @@
+#%% MODULE BEGINS
+# module_name = "derived_metrics.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import weakref
+
+# Third-Party Library Imports
+import numpy as np
+import pandas as pd
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+CAUSE_COLUMNS = ("carrier_delay", "weather_delay", "nas_delay", "security_delay", "late_aircraft_delay")
+
+
+#%% FUNCTION DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def ratio(numerator, denominator):
+    """Element-wise numerator / denominator; NaN where the denominator is zero or missing."""
+    result = np.full(len(numerator), np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def default_metrics():
+    """
+    Built-in derived metrics as (name, expression, depends_on, description) tuples.
+    """
+    metrics = [
+        ("delay_rate", ratio, ("arr_del15", "arr_flights"), "Share of flights delayed 15+ minutes"),
+        ("minutes_per_flight", ratio, ("arr_delay", "arr_flights"), "Arrival delay minutes per flight"),
+        ("minutes_per_delayed_flight", ratio, ("arr_delay", "arr_del15"),
+         "Arrival delay minutes per delayed flight"),
+        ("cancellation_rate", ratio, ("arr_cancelled", "arr_flights"), "Share of flights cancelled"),
+        ("diversion_rate", ratio, ("arr_diverted", "arr_flights"), "Share of flights diverted"),
+    ]
+    for cause in CAUSE_COLUMNS:
+        metrics.append((f"{cause}_share", ratio, (cause, "arr_delay"), f"Share of arrival delay minutes from {cause}"))
+    return metrics
+
+
+#%% CLASS DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class DerivedMetricRegistry:
+    """
+    Registry of named derived columns computed lazily from a DataFrame.
+
+    Features:
+    - Each metric is a vectorized expression over its dependency columns, which may
+      be source columns or other derived metrics.
+    - Values are computed on first use and cached per DataFrame (several frames can
+      share one registry). Cached values are keyed by the frame's data version and a
+      change token of each source column, so they are reused until a source changes.
+    - Methods that modify a frame report it with invalidate(column, frame) or
+      touch(frame); only the metrics that depend on a changed column, directly or
+      through other metrics, are recomputed.
+    - Can add metrics to a DataFrame as regular columns, so existing stats, queries and
+      plots can use them by name.
+    """
+
+    def __init__(self, include_defaults=True):
+        """
+        Initialize the registry.
+
+        Args:
+        - include_defaults: Whether to register the built-in metrics (delay_rate, ...)
+        """
+        self.metrics = {}  # name -> {"expression", "depends_on", "description"}
+        # id(frame) -> {"ref": weak reference, "version": data version,
+        #               "tokens": {source column: change token}, "cache": {name: (key, values)}}
+        self.frame_states = {}
+        if include_defaults:
+            for name, expression, depends_on, description in default_metrics():
+                self.register(name, expression, depends_on, description)
+
+    def __contains__(self, name):
+        return name in self.metrics
+
+    @property
+    def names(self):
+        return list(self.metrics)
+
+    def register(self, name, expression, depends_on, description=""):
+        """
+        Register (or replace) a derived metric.
+
+        Args:
+        - name: Column name of the metric
+        - expression: Function taking one NumPy array per dependency, in order, and
+          returning an array of the same length
+        - depends_on: Names of the source columns or metrics the expression uses
+        - description: Short human-readable description
+        """
+        depends_on = tuple(depends_on)
+        if name in depends_on:
+            raise ValueError(f"Metric '{name}' cannot depend on itself.")
+        self.metrics[name] = {"expression": expression, "depends_on": depends_on, "description": description}
+        self.invalidate(name)
+
+    def source_columns(self, name):
+        """Return the source columns a metric depends on, following metric dependencies."""
+        columns, pending, seen = set(), [name], set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                raise ValueError(f"Circular dependency involving metric '{current}'.")
+            seen.add(current)
+            for dependency in self.metrics[current]["depends_on"]:
+                if dependency in self.metrics:
+                    pending.append(dependency)
+                else:
+                    columns.add(dependency)
+        return columns
+
+    def expand(self, columns):
+        """
+        Replace derived metric names by the source columns they are computed from.
+
+        Returns:
+        - List of source column names, in first-seen order, without duplicates
+        """
+        expanded = []
+        for column in columns:
+            sources = sorted(self.source_columns(column)) if column in self.metrics else [column]
+            expanded.extend(source for source in sources if source not in expanded)
+        return expanded
+
+    def dependents(self, column):
+        """Return all metrics that depend on a column or metric, directly or transitively."""
+        found, pending = set(), [column]
+        while pending:
+            current = pending.pop()
+            for name, metric in self.metrics.items():
+                if current in metric["depends_on"] and name not in found:
+                    found.add(name)
+                    pending.append(name)
+        return found
+
+    def compute(self, frame, name):
+        """
+        Return the values of a metric for a DataFrame, computing them on first use.
+
+        Args:
+        - frame: Source DataFrame
+        - name: Metric name
+
+        Returns:
+        - NumPy array aligned with the rows of frame
+        """
+        if name not in self.metrics:
+            raise KeyError(f"Derived metric '{name}' is not registered.")
+        state = self._state(frame)
+        key = (state["version"], len(frame),
+               tuple(state["tokens"].get(column, 0) for column in sorted(self.source_columns(name))))
+        cached = state["cache"].get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        metric = self.metrics[name]
+        arguments = []
+        for dependency in metric["depends_on"]:
+            if dependency in self.metrics:
+                arguments.append(self.compute(frame, dependency))
+            elif dependency in frame.columns:
+                arguments.append(frame[dependency].to_numpy(dtype=float))
+            else:
+                raise KeyError(f"Column '{dependency}' required by metric '{name}' not found in dataset.")
+        values = np.asarray(metric["expression"](*arguments), dtype=float)
+        values.flags.writeable = False
+        state["cache"][name] = (key, values)
+        return values
+
+    def get(self, frame, name):
+        """Return a metric as a Series aligned with frame."""
+        return pd.Series(self.compute(frame, name), index=frame.index, name=name)
+
+    def materialize(self, frame, names):
+        """
+        Add metrics to a DataFrame as regular columns (skipping ones already present).
+
+        Returns:
+        - List of the columns that were added
+        """
+        added = [name for name in names if name not in frame.columns]
+        for name in added:
+            frame[name] = self.compute(frame, name)
+        return added
+
+    def _state(self, frame):
+        """Return the cache state of a frame, creating it on first use."""
+        state = self.frame_states.get(id(frame))
+        # A dead reference means the id now belongs to a different frame
+        if state is None or state["ref"]() is not frame:
+            reference = weakref.ref(frame, self._forget)
+            state = {"ref": reference, "version": 0, "tokens": {}, "cache": {}}
+            self.frame_states[id(frame)] = state
+        return state
+
+    def _forget(self, reference):
+        """Drop the state of a frame that was garbage collected."""
+        for key, state in list(self.frame_states.items()):
+            if state["ref"] is reference:
+                del self.frame_states[key]
+
+    def invalidate(self, column, frame=None):
+        """
+        Mark a source column (or a re-registered metric) as changed.
+
+        Bumps the column's change token and drops the cached values of every metric
+        that depends on it.
+
+        Args:
+        - column: Changed column or metric name
+        - frame: The modified DataFrame; every frame using the registry when None
+
+        Returns:
+        - Set of the invalidated metric names
+        """
+        invalidated = self.dependents(column)
+        if column in self.metrics:
+            invalidated.add(column)
+        states = list(self.frame_states.values()) if frame is None else [self._state(frame)]
+        for state in states:
+            state["tokens"][column] = state["tokens"].get(column, 0) + 1
+            for name in invalidated:
+                state["cache"].pop(name, None)
+        return invalidated
+
+    def version(self, frame):
+        """Return the data version of a frame (bumped by touch)."""
+        return self._state(frame)["version"]
+
+    def touch(self, frame):
+        """Mark every column of a frame as changed (new data version)."""
+        state = self._state(frame)
+        state["version"] += 1
+        state["cache"].clear()
+
+    def clear(self):
+        """Drop all cached values."""
+        self.frame_states.clear()
+
+    def describe(self):
+        """Return a DataFrame listing every metric, its dependencies and description."""
+        return pd.DataFrame([
+            {"Metric": name, "Depends On": ", ".join(metric["depends_on"]), "Description": metric["description"]}
+            for name, metric in self.metrics.items()
+        ])
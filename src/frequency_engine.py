@@ -0,0 +1,145 @@
+#%% MODULE BEGINS
+# module_name = "frequency_engine.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Third-Party Library Imports
+import numpy as np
+import pandas as pd
+
+# Relative Imports
+from .data_loader import iter_chunks
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+OTHER_LABEL = "Other"
+
+
+#%% CLASS DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class HeavyHitters:
+    """
+    Misra-Gries heavy-hitters summary for streamed values.
+
+    Keeps at most `capacity` counters. Each reported count underestimates the true
+    count by at most n / (capacity + 1), so every value more frequent than that is
+    guaranteed to be kept. Batches are counted with NumPy and merged into the summary.
+    """
+
+    def __init__(self, capacity=100):
+        """
+        Initialize an empty summary.
+
+        Args:
+        - capacity: Maximum number of counters kept
+        """
+        self.capacity = capacity
+        self.counters = {}
+        self.n = 0
+
+    @property
+    def error_bound(self):
+        """Maximum undercount of any reported count."""
+        return self.n / (self.capacity + 1)
+
+    def update(self, values):
+        """Add a batch of values (missing values are ignored)."""
+        values = pd.Series(values).dropna()
+        uniques, counts = np.unique(values.to_numpy(), return_counts=True)
+        self.n += int(counts.sum())
+        for value, count in zip(uniques.tolist(), counts.tolist()):
+            self.counters[value] = self.counters.get(value, 0) + count
+        if len(self.counters) > self.capacity:
+            # Merge rule of Misra-Gries summaries: subtract the (capacity + 1)-th largest
+            # count from every counter and drop the ones that reach zero
+            all_counts = np.fromiter(self.counters.values(), dtype=np.int64, count=len(self.counters))
+            threshold = np.partition(all_counts, len(all_counts) - self.capacity - 1)[len(all_counts) - self.capacity - 1]
+            self.counters = {value: count - threshold for value, count in self.counters.items() if count > threshold}
+        return self
+
+    def top_k(self, k):
+        """Return the k values with the largest (lower-bound) counts as a Series."""
+        items = sorted(self.counters.items(), key=lambda item: (-item[1], str(item[0])))[:k]
+        return pd.Series([count for _, count in items], index=[value for value, _ in items], name="Count")
+
+
+class FrequencyEngine:
+    """
+    Value frequencies of categorical columns.
+
+    Features:
+    - Columns are integer-encoded once (cached); counts are a single bincount.
+    - Exact top-k by partial selection (argpartition) instead of a full sort.
+    - Everything outside the top-k is folded into one 'Other' bucket.
+    - Streaming top-k over CSV chunks with a Misra-Gries heavy-hitters summary.
+    """
+
+    def __init__(self, data=None):
+        """
+        Initialize the engine.
+
+        Args:
+        - data: Source DataFrame (optional for streaming use)
+        """
+        self.data = data
+        self.counts_cache = {}  # column -> (labels, counts)
+
+    def counts(self, column):
+        """Return (labels, counts) of all non-missing values of a column (cached)."""
+        if column not in self.counts_cache:
+            if self.data is None or column not in self.data.columns:
+                raise ValueError(f"Column '{column}' not found in dataset.")
+            codes, labels = pd.factorize(self.data[column])
+            counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+            self.counts_cache[column] = (labels, counts)
+        return self.counts_cache[column]
+
+    def top_k(self, column, k=20, other=True):
+        """
+        Exact k most frequent values of a column.
+
+        Args:
+        - column: Column name (e.g., 'airport')
+        - k: Number of values to keep
+        - other: Whether to append an 'Other' bucket with the remaining count
+
+        Returns:
+        - Series of counts indexed by value, most frequent first (ties by value)
+        """
+        labels, counts = self.counts(column)
+        if k < len(counts):
+            top = np.argpartition(-counts, k - 1)[:k]
+        else:
+            top = np.arange(len(counts))
+        top_labels = np.asarray(labels, dtype=object)[top]
+        order = np.lexsort((top_labels.astype(str), -counts[top]))
+        result = pd.Series(counts[top][order], index=pd.Index(top_labels[order], name=column), name="Count")
+        remaining = int(counts.sum() - result.sum())
+        if other and remaining:
+            result = pd.concat([result, pd.Series([remaining], index=[OTHER_LABEL], name="Count")])
+            result.index.name = column
+        return result
+
+    def stream_top_k(self, source, column, k=20, capacity=None, chunk_size=100_000):
+        """
+        Approximate top-k of a column of the input files read in chunks.
+
+        Args:
+        - source: Path to a CSV file, a directory of CSV files or a glob pattern
+        - column: Column name
+        - k: Number of values to return
+        - capacity: Counters kept by the summary (defaults to 10 * k)
+        - chunk_size: Rows read per chunk
+
+        Returns:
+        - tuple: (Series of lower-bound counts, maximum undercount per value)
+        """
+        summary = HeavyHitters(capacity or 10 * k)
+        found = False
+        for chunk in iter_chunks(source, columns=[column], chunk_size=chunk_size):
+            # Files without the column are skipped by iter_chunks
+            if column in chunk.columns:
+                found = True
+                summary.update(chunk[column])
+        if not found:
+            raise ValueError(f"Column '{column}' not found in input.")
+        return summary.top_k(k), summary.error_bound
@@ -28,13 +28,18 @@ from .stats_analyzer import AdvanceCalculations
 from .probability_calc import ProbabilityCalculations
 from .permutations_combinations import Permutations_Combination_Calculator
 from .vector_operations import VectorOperations
-from .config import DATA_PATH, OUTPUT_FOLDER
+from .weighted_stats import WeightedStatistics
+from .result_collector import ResultCollector
+from .config import DATA_PATH, OUTPUT_FOLDER, ANALYSIS_COLUMNS
 
 # Standard imports
 import logging
 
 #%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 LOG_FILE = "app.log"
+# Operations offered by the menu whose extra columns must be loaded at startup
+MENU_OPERATIONS = ["visualize_delays", "query_arrival_delays_by_carrier", "categorize_airports",
+                   "plot_violin", "plot_box", "plot_scatter"]
 
 #%% CONFIGURATION   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 def setup_logging():
@@ -61,27 +66,42 @@ def main():
     # Initialize classes
     try:
         # Parent handler initialization
+        # Only the columns the menu can use are read (column projection)
         parent_handler = DataHandler()
-        parent_handler.load_data()
+        child_visualizer = DataVisualizer()
+        parent_handler.load_data(columns=child_visualizer.columns_for(MENU_OPERATIONS, ANALYSIS_COLUMNS))
 
         # Child visualizer initialization
-        child_visualizer = DataVisualizer()
+        child_visualizer.derived_metrics = parent_handler.derived_metrics
+        child_visualizer.loaded_columns = parent_handler.loaded_columns
         child_visualizer.data_df = parent_handler.data_df
 
         # Configuration setup for dependent modules
+        # One result collector per session, shared by all calculators
+        result_collector = ResultCollector(OUTPUT_FOLDER)
         config = {
             "DATA_PATH": DATA_PATH,
-            "OUTPUT_FOLDER": OUTPUT_FOLDER
+            "OUTPUT_FOLDER": OUTPUT_FOLDER,
+            "RESULT_COLLECTOR": result_collector,
+            "DERIVED_METRICS": parent_handler.derived_metrics,
+            "COLUMNS": parent_handler.loaded_columns
         }
 
         # Module-specific initializations
+        # The dataset is parsed (and validated) once by the parent handler and shared,
+        # as with child_visualizer
         advance_analysis = AdvanceCalculations(config)
-        advance_analysis.load_data()
+        advance_analysis.data = parent_handler.data_df
         probability_calc = ProbabilityCalculations(config)
-        probability_calc.load_data()
+        probability_calc.data = advance_analysis.data
+        weighted_stats = WeightedStatistics(config)
+        weighted_stats.data = advance_analysis.data
         vector_ops = VectorOperations(config)
         permutation_combination_calc = Permutations_Combination_Calculator(config)
-        permutation_combination_calc.load_data()
+        permutation_combination_calc.data = advance_analysis.data
+        # Shared frames carry the parent's projection, so missing columns report "not loaded"
+        for calculator in (advance_analysis, probability_calc, weighted_stats, permutation_combination_calc):
+            calculator.loaded_columns = parent_handler.loaded_columns
         
 
         logging.info("Data and modules initialized successfully.")
@@ -114,7 +134,8 @@ def main():
             # Carrier Frequency Calculation. Creates Multiple line plot
             if choice == "1":
                 column = input("Enter the column name for carrier frequencies (e.g., 'carrier_name'): ")
-                parent_handler.visualize_column(column)
+                streaming = input("Stream from the input files (approximate top values)? (y/n): ").strip().lower()
+                parent_handler.visualize_column(column, streaming=streaming == "y")
             # Creates single line plot for delay types
             elif choice == "2":
                 parent_handler.visualize_delays()
@@ -156,8 +177,9 @@ def main():
                 print("\nMean Calculation Options:")
                 print("1. Calculate Simple Mean")
                 print("2. Calculate Weighted Mean")
+                print("3. Calculate Weighted Statistics (median, quantiles, std)")
 
-                mean_choice = input("Enter your choice (1-2): ")
+                mean_choice = input("Enter your choice (1-3): ")
 
                 if mean_choice == "1":
                     column = input("Enter the column name for simple mean (e.g., 'arr_delay'): ")
@@ -170,6 +192,14 @@ def main():
                     weighted_mean = probability_calc.calculate_weighted_mean(column, weights_column)
                     print(f"Weighted Mean of {column} with weights from {weights_column}: {weighted_mean}")
 
+                elif mean_choice == "3":
+                    column = input("Enter the column name for weighted statistics (e.g., 'arr_delay'): ")
+                    weights_column = input("Enter the weights column (e.g., 'arr_flights'): ")
+                    group_column = input("Enter a column to group by (e.g., 'carrier'), or leave blank: ").strip()
+                    weighted_results = weighted_stats.calculate_weighted_statistics(
+                        column, weights_column, group_column or None)
+                    print(weighted_results)
+
                 else:
                     print("Invalid choice. Returning to main menu.")
             # Median Calculation
@@ -222,6 +252,13 @@ def main():
                     numeric_columns = vector_ops.data.select_dtypes(include=['number']).columns
                     print(", ".join(numeric_columns))
 
+                    pair_mode = input("Compare all numeric column pairs at once? (y/n): ").strip().lower()
+                    if pair_mode == "y":
+                        pairwise_results = vector_ops.perform_pairwise_vector_operations(list(numeric_columns))
+                        print("\nAngle between columns (degrees):")
+                        print(pairwise_results["Angle (degrees)"].round(2))
+                        continue
+
                     column1 = input("Enter the first numeric column (e.g., 'arr_delay'): ").strip()
                     column2 = input("Enter the second numeric column (e.g., 'arr_flights'): ").strip()
 
@@ -229,7 +266,12 @@ def main():
                         print("Error: One or both columns not found in numeric columns.")
                         continue
 
-                    results, vector1, vector2 = vector_ops.perform_vector_operations(column1, column2)
+                    print("\nAvailable operations:")
+                    print(", ".join(list(vector_ops.VECTOR_OPERATIONS) + list(vector_ops.SCALAR_OPERATIONS)))
+                    selected = input("Enter operations separated by commas (leave blank for all): ").strip()
+                    operations = [op.strip() for op in selected.split(",")] if selected else None
+
+                    results, vector1, vector2 = vector_ops.perform_vector_operations(column1, column2, operations)
                     
                     print("\nInput Vectors:")
                     print(f"Vector 1 ({column1}): {vector1}")
@@ -247,19 +289,21 @@ def main():
                 print("Available columns for histogram:")
                 print(", ".join(child_visualizer.data_df.columns))
                 column = input("Enter the column name for the histogram (e.g., 'arr_delay'): ")
-                parent_handler.visualize_delay_histogram(column)
+                strategy = input("Bin strategy - fixed, log or quantile (default: fixed): ").strip() or "fixed"
+                parent_handler.visualize_delay_histogram(column, strategy=strategy)
                 
         # Permuatation and Combination Calculation 
             elif choice == "14":
                 print("\nCombinatorics Analysis Menu:")
                 print("1. Analyze Categorical Column")
-                print("2. Back to Main Menu")
+                print("2. Analyze All Categorical Columns (batch)")
+                print("3. Back to Main Menu")
 
-                comb_choice = input("Enter your choice (1-2): ")
+                comb_choice = input("Enter your choice (1-3): ")
 
                 if comb_choice == "1":
                     print("\nAvailable categorical columns:")
-                    print(", ".join(permutation_combination_calc.data.select_dtypes(include=['object']).columns))
+                    print(", ".join(permutation_combination_calc.data.select_dtypes(include=['object', 'category']).columns))
                     column = input("Enter the categorical column name to analyze: ")
                     
                     # Get unique values and their count
@@ -278,6 +322,11 @@ def main():
                     print(f"Combinations C({unique_values},{r}): {comb_result}")
 
                 elif comb_choice == "2":
+                    max_r = int(input("\nEnter the largest r to analyze (e.g., 3): "))
+                    batch_results = permutation_combination_calc.analyze_all_column_combinations(max_r=max_r)
+                    print(batch_results)
+
+                elif comb_choice == "3":
                     print("Returning to main menu.")
                     
                 else:
@@ -285,6 +334,7 @@ def main():
 
             elif choice == "15":
                 logging.info("Exiting the application.")
+                result_collector.flush()
                 print("Goodbye!")
                 break
 
@@ -0,0 +1,177 @@
+#%% MODULE BEGINS
+# module_name = "numeric_store.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Third-Party Library Imports
+import numpy as np
+
+
+class NumericColumnStore:
+    """
+    Contiguous column-major store of all numeric columns plus a packed NaN bitmap.
+
+    Features:
+    - Built once from a DataFrame: one float64 Fortran-ordered matrix, so every
+      column is a contiguous, zero-copy view.
+    - Missing values are stored as 0 and tracked in a packed validity bitmap
+      (one bit per row per column), so the zero-filled view needs no copy.
+    - Callers choose a NaN policy per access: 'zero' (zero-copy), 'skip' (valid
+      rows only) or 'propagate' (NaN where missing).
+    - Reductions (count, sum, mean, std) honour the policy without allocating
+      filled copies of the column.
+    """
+    NAN_POLICIES = ("zero", "skip", "propagate")
+
+    def __init__(self, data_frame):
+        """
+        Build the store from the numeric columns of a DataFrame.
+
+        Args:
+        - data_frame: Source DataFrame
+        """
+        self.columns = list(data_frame.select_dtypes(include=['number', 'bool']).columns)
+        self.column_index = {column: i for i, column in enumerate(self.columns)}
+        self.n_rows = len(data_frame)
+        self.source_id = id(data_frame)
+
+        self.values = np.empty((self.n_rows, len(self.columns)), dtype=np.float64, order="F")
+        self.validity = np.empty(((self.n_rows + 7) // 8, len(self.columns)), dtype=np.uint8, order="F")
+        self.valid_counts = np.empty(len(self.columns), dtype=np.int64)
+
+        for j, column in enumerate(self.columns):
+            target = self.values[:, j]
+            target[:] = data_frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(target)
+            np.copyto(target, 0.0, where=~valid)
+            self.validity[:, j] = np.packbits(valid, bitorder="little")
+            self.valid_counts[j] = np.count_nonzero(valid)
+
+        # Views handed out must not be able to modify the store
+        self.values.flags.writeable = False
+
+    def __contains__(self, column):
+        return column in self.column_index
+
+    @property
+    def nbytes(self):
+        """Memory used by the value matrix and the validity bitmap."""
+        return self.values.nbytes + self.validity.nbytes
+
+    def _position(self, column):
+        """Return the matrix position of a column, raising if it is not stored."""
+        if column not in self.column_index:
+            raise ValueError(f"Column '{column}' is not a numeric column in the store.")
+        return self.column_index[column]
+
+    def _check_policy(self, nan_policy):
+        if nan_policy not in self.NAN_POLICIES:
+            raise ValueError(f"Unsupported NaN policy '{nan_policy}'. Use one of: {', '.join(self.NAN_POLICIES)}.")
+
+    def has_missing(self, column):
+        """Return True if the column has at least one missing value."""
+        return bool(self.valid_counts[self._position(column)] < self.n_rows)
+
+    def valid_mask(self, column):
+        """
+        Unpack the validity bitmap of a column.
+
+        Args:
+        - column: Column name
+
+        Returns:
+        - Boolean array, True where the value is present
+        """
+        j = self._position(column)
+        return np.unpackbits(self.validity[:, j], count=self.n_rows, bitorder="little").view(bool)
+
+    def column(self, column, nan_policy="zero"):
+        """
+        Return a column under the requested NaN policy.
+
+        Args:
+        - column: Column name
+        - nan_policy: 'zero' returns a read-only zero-copy view with missing values as 0;
+          'skip' returns only the valid values; 'propagate' returns NaN where missing.
+          'skip' and 'propagate' only allocate when the column has missing values.
+
+        Returns:
+        - 1-D float64 array
+        """
+        self._check_policy(nan_policy)
+        view = self.values[:, self._position(column)]
+        if nan_policy == "zero" or not self.has_missing(column):
+            return view
+        mask = self.valid_mask(column)
+        if nan_policy == "skip":
+            return view[mask]
+        return np.where(mask, view, np.nan)
+
+    def matrix(self, columns=None):
+        """
+        Return several columns as one 2-D array with missing values as 0.
+
+        Args:
+        - columns: Column names; all stored columns (zero-copy) when None
+
+        Returns:
+        - 2-D float64 array with one column per requested column
+        """
+        if columns is None:
+            return self.values
+        return self.values[:, [self._position(column) for column in columns]]
+
+    # --------------------
+    # Reductions
+    # --------------------
+
+    def count(self, column):
+        """Number of non-missing values in a column."""
+        return int(self.valid_counts[self._position(column)])
+
+    def sum(self, column, nan_policy="skip"):
+        """
+        Sum of a column; missing values add 0 under 'skip' and 'zero', NaN under 'propagate'.
+        """
+        self._check_policy(nan_policy)
+        if nan_policy == "propagate" and self.has_missing(column):
+            return np.nan
+        return float(np.sum(self.column(column, "zero")))
+
+    def mean(self, column, nan_policy="skip"):
+        """
+        Mean of a column.
+
+        Args:
+        - column: Column name
+        - nan_policy: 'skip' averages valid values only, 'zero' counts missing values
+          as 0, 'propagate' returns NaN if any value is missing
+        """
+        self._check_policy(nan_policy)
+        if nan_policy == "propagate" and self.has_missing(column):
+            return np.nan
+        count = self.n_rows if nan_policy == "zero" else self.count(column)
+        if count == 0:
+            return np.nan
+        return float(np.sum(self.column(column, "zero")) / count)
+
+    def std(self, column, nan_policy="skip", ddof=1):
+        """
+        Standard deviation of a column under the requested NaN policy.
+
+        Under 'skip' deviations are taken over the valid rows only (missing rows
+        contribute 0), so no copy of the valid values is built and no large terms
+        are subtracted afterwards.
+        """
+        self._check_policy(nan_policy)
+        mean = self.mean(column, nan_policy)
+        if np.isnan(mean):
+            return np.nan
+        count = self.n_rows if nan_policy == "zero" else self.count(column)
+        if count - ddof <= 0:
+            return np.nan
+        deviations = self.column(column, "zero") - mean
+        if nan_policy == "skip" and self.has_missing(column):
+            deviations = np.where(self.valid_mask(column), deviations, 0.0)
+        squared = float(np.dot(deviations, deviations))
+        return float(np.sqrt(squared / (count - ddof)))
@@ -0,0 +1,312 @@
+#%% MODULE BEGINS
+# module_name = "parallel_executor.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Third-Party Library Imports
+import numpy as np
+import pandas as pd
+
+# Relative Imports
+from .numeric_store import NumericColumnStore
+
+
+#%% WORKER FUNCTIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Workers receive only shared-memory descriptors (name, shape, dtype) and
+# attach to the parent's arrays without copying them.
+
+def _attach(spec):
+    """Attach to a shared array described by (name, shape, dtype); returns (shm, array)."""
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf, order="F")
+
+
+def _grouped_moments_task(values_spec, validity_spec, codes_spec, positions, n_groups, start, stop):
+    """Per-group count, mean and sum of squared deviations (M2) of the columns over rows [start, stop)."""
+    handles = [_attach(spec) for spec in (values_spec, validity_spec, codes_spec)]
+    try:
+        (_, values), (_, validity), (_, codes) = handles
+        codes = codes[start:stop]
+        moments = np.zeros((3, len(positions), n_groups))
+        for i, j in enumerate(positions):
+            # Bitmap bytes cover 8 rows each; ranges start on a multiple of 8
+            valid = np.unpackbits(validity[start // 8:(stop + 7) // 8, j], count=stop - start,
+                                  bitorder="little").view(bool)
+            column = values[start:stop, j]
+            count = np.bincount(codes, weights=valid, minlength=n_groups)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = np.where(count > 0, np.bincount(codes, weights=column, minlength=n_groups) / count, 0.0)
+            # Center on the chunk's group means before squaring to avoid cancellation
+            deviations = np.where(valid, column - mean[codes], 0.0)
+            moments[0, i] = count
+            moments[1, i] = mean
+            moments[2, i] = np.bincount(codes, weights=deviations * deviations, minlength=n_groups)
+        return moments
+    finally:
+        for shm, _ in handles:
+            shm.close()
+
+
+def _merge_moments(left, right):
+    """Combine two (count, mean, M2) summaries with Chan's parallel update."""
+    count_a, mean_a, m2_a = left
+    count_b, mean_b, m2_b = right
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(count > 0, count_b / count, 0.0)
+    return count, mean_a + delta * share, m2_a + m2_b + delta * delta * count_a * share
+
+
+def _grouped_median_task(values_spec, validity_spec, order_spec, position, boundaries):
+    """Medians of one column for a contiguous range of groups (rows pre-sorted by group)."""
+    handles = [_attach(spec) for spec in (values_spec, validity_spec, order_spec)]
+    try:
+        (_, values), (_, validity), (_, order) = handles
+        valid = np.unpackbits(validity[:, position], count=values.shape[0], bitorder="little").view(bool)
+        medians = []
+        for start, stop in zip(boundaries[:-1], boundaries[1:]):
+            rows = order[start:stop]
+            group_values = values[rows, position][valid[rows]]
+            medians.append(np.median(group_values) if len(group_values) else np.nan)
+        return np.array(medians)
+    finally:
+        for shm, _ in handles:
+            shm.close()
+
+
+def _bootstrap_task(values_spec, validity_spec, position, n_resamples, seed_sequence):
+    """Means of n_resamples bootstrap samples of the valid values of one column."""
+    handles = [_attach(spec) for spec in (values_spec, validity_spec)]
+    try:
+        (_, values), (_, validity) = handles
+        n_rows = values.shape[0]
+        valid = np.unpackbits(validity[:, position], count=n_rows, bitorder="little").view(bool)
+        sample = values[valid, position]
+        rng = np.random.default_rng(seed_sequence)
+        means = np.empty(n_resamples)
+        for i in range(n_resamples):
+            means[i] = sample[rng.integers(0, len(sample), len(sample))].mean()
+        return means
+    finally:
+        for shm, _ in handles:
+            shm.close()
+
+
+def _contingency_task(codes1_spec, codes2_spec, n1, n2, start, stop):
+    """Joint counts of two coded columns over rows [start, stop)."""
+    handles = [_attach(spec) for spec in (codes1_spec, codes2_spec)]
+    try:
+        (_, codes1), (_, codes2) = handles
+        codes1, codes2 = codes1[start:stop], codes2[start:stop]
+        present = (codes1 >= 0) & (codes2 >= 0)
+        combined = codes1[present] * n2 + codes2[present]
+        return np.bincount(combined, minlength=n1 * n2).reshape(n1, n2)
+    finally:
+        for shm, _ in handles:
+            shm.close()
+
+
+#%% CLASS DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ParallelGroupExecutor:
+    """
+    Multi-core grouped analytics over numeric columns held in shared memory.
+
+    Features:
+    - Copies the numeric column store (values and validity bitmap) into
+      multiprocessing.shared_memory once; workers attach without copying.
+    - Partitions work by row ranges (grouped moments, contingency counts) or by
+      group key (grouped medians) across a process pool.
+    - Row ranges have a fixed size and partial results are merged in task
+      order, so results do not depend on scheduling or on the number of workers.
+
+    Use as a context manager so shared memory is always released:
+
+        with ParallelGroupExecutor(data) as executor:
+            executor.grouped_statistics("carrier", ["arr_delay"])
+    """
+
+    def __init__(self, data, store=None, max_workers=None, chunk_rows=65536):
+        """
+        Initialize the executor.
+
+        Args:
+        - data: Source DataFrame (used to encode group columns)
+        - store: Optional NumericColumnStore of data; built when not given
+        - max_workers: Number of worker processes (defaults to the CPU count)
+        - chunk_rows: Rows per row-range task (rounded up to a multiple of 8)
+        """
+        self.data = data
+        self.store = store if store is not None else NumericColumnStore(data)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_rows = max(8, chunk_rows + (-chunk_rows) % 8)
+        self.pool = None
+        self.shared_blocks = []
+        self.values_spec = None
+        self.validity_spec = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """Place the numeric store in shared memory and start the process pool."""
+        if self.pool is not None:
+            return
+        self.values_spec = self._share(self.store.values)
+        self.validity_spec = self._share(self.store.validity)
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def close(self):
+        """Shut down the pool and release all shared memory."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        for shm in self.shared_blocks:
+            shm.close()
+            shm.unlink()
+        self.shared_blocks = []
+
+    def _share(self, array):
+        """Copy an array into a new shared memory block and return its descriptor."""
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.shared_blocks.append(shm)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf, order="F")[...] = array
+        return shm.name, array.shape, array.dtype.str
+
+    def _release(self, spec):
+        """Release a per-call shared block created by _share."""
+        for shm in list(self.shared_blocks):
+            if shm.name == spec[0]:
+                shm.close()
+                shm.unlink()
+                self.shared_blocks.remove(shm)
+
+    def _row_ranges(self):
+        """Split rows into fixed-size ranges aligned to the 8-row bytes of the validity bitmap."""
+        n_rows = self.store.n_rows
+        return [(start, min(start + self.chunk_rows, n_rows)) for start in range(0, n_rows, self.chunk_rows)]
+
+    def _encode(self, column):
+        """Integer-encode a column (sorted categories; -1 for missing)."""
+        if column not in self.data.columns:
+            raise ValueError(f"Column '{column}' not found in dataset.")
+        codes, labels = pd.factorize(self.data[column], sort=True)
+        return codes.astype(np.int64), pd.Index(labels, name=column)
+
+    def _positions(self, columns):
+        return [self.store._position(column) for column in columns]
+
+    # --------------------
+    # Operations
+    # --------------------
+
+    def grouped_statistics(self, group_column, columns):
+        """
+        Count, mean and standard deviation of columns per group, over row ranges in parallel.
+
+        Args:
+        - group_column: Column to group by (e.g. 'carrier', 'airport', 'month')
+        - columns: Numeric columns to summarize
+
+        Returns:
+        - DataFrame indexed by group with '<column>_count', '_mean' and '_std' columns
+        """
+        self.start()
+        codes, labels = self._encode(group_column)
+        # Rows with a missing group are sent to an extra bucket that is dropped
+        codes = np.where(codes < 0, len(labels), codes)
+        codes_spec = self._share(codes)
+        try:
+            positions = self._positions(columns)
+            futures = [self.pool.submit(_grouped_moments_task, self.values_spec, self.validity_spec,
+                                        codes_spec, positions, len(labels) + 1, start, stop)
+                       for start, stop in self._row_ranges()]
+            count = mean = m2 = 0.0
+            for future in futures:
+                count, mean, m2 = _merge_moments((count, mean, m2), future.result())
+        finally:
+            self._release(codes_spec)
+
+        count, mean, m2 = (moment[:, :len(labels)] for moment in (count, mean, m2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(count > 0, mean, np.nan)
+            variance = m2 / (count - 1)
+        result = pd.DataFrame(index=labels)
+        for i, column in enumerate(columns):
+            result[f"{column}_count"] = count[i].astype(np.int64)
+            result[f"{column}_mean"] = mean[i]
+            result[f"{column}_std"] = np.sqrt(np.clip(variance[i], 0, None))
+        return result
+
+    def grouped_median(self, group_column, column):
+        """
+        Median of a column per group, with groups partitioned across workers.
+
+        Returns:
+        - Series indexed by group
+        """
+        self.start()
+        codes, labels = self._encode(group_column)
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        bounds = np.searchsorted(sorted_codes, np.arange(len(labels) + 1), side="left")
+        order_spec = self._share(order)
+        try:
+            position = self.store._position(column)
+            group_chunks = np.array_split(np.arange(len(labels)), max(1, min(len(labels), 4 * self.max_workers)))
+            futures = [self.pool.submit(_grouped_median_task, self.values_spec, self.validity_spec,
+                                        order_spec, position, bounds[chunk[0]:chunk[-1] + 2])
+                       for chunk in group_chunks if len(chunk)]
+            medians = np.concatenate([future.result() for future in futures])
+        finally:
+            self._release(order_spec)
+        return pd.Series(medians, index=labels, name=f"{column}_median")
+
+    def bootstrap_mean(self, column, n_resamples=1000, seed=0, batch_size=50):
+        """
+        Bootstrap distribution of the mean of a column, resamples split across workers.
+
+        Each batch of resamples gets its own child seed, so the result is the same
+        for any number of workers.
+
+        Returns:
+        - Array of n_resamples bootstrap means
+        """
+        self.start()
+        position = self.store._position(column)
+        batches = [min(batch_size, n_resamples - start) for start in range(0, n_resamples, batch_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(batches))
+        futures = [self.pool.submit(_bootstrap_task, self.values_spec, self.validity_spec, position, size, child)
+                   for size, child in zip(batches, seeds)]
+        return np.concatenate([future.result() for future in futures]) if futures else np.empty(0)
+
+    def contingency_counts(self, col1, col2):
+        """
+        Joint counts of two categorical columns, over row ranges in parallel.
+
+        Returns:
+        - DataFrame of counts with col1 values as rows and col2 values as columns
+        """
+        self.start()
+        codes1, labels1 = self._encode(col1)
+        codes2, labels2 = self._encode(col2)
+        spec1, spec2 = self._share(codes1), self._share(codes2)
+        try:
+            futures = [self.pool.submit(_contingency_task, spec1, spec2, len(labels1), len(labels2), start, stop)
+                       for start, stop in self._row_ranges()]
+            counts = sum(future.result() for future in futures)
+        finally:
+            self._release(spec1)
+            self._release(spec2)
+        return pd.DataFrame(counts, index=labels1, columns=labels2)
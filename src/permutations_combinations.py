@@ -1,6 +1,9 @@
 import os
+from itertools import chain, combinations, islice
+import numpy as np
 import pandas as pd
 from .stats_analyzer import AdvanceCalculations
+from .combinatorics import CombinatoricsEngine
 
 
 class Permutations_Combination_Calculator(AdvanceCalculations):
@@ -10,9 +13,14 @@ class Permutations_Combination_Calculator(AdvanceCalculations):
     Features:
     - Calculates permutations and combinations with and without repetition
     - Handles circular permutations and partial permutations
-    - Saves results to output files
+    - Records results in the session result collector (one consolidated file)
     - Supports bulk calculations on dataset columns
+    - Exact results without huge intermediate factorials, or log-space magnitudes
+    - Lazily enumerates combinations of column values with vectorized per-combination analytics
     """
+    OPERATION_COLUMNS = {
+        "iter_combination_analytics": ["arr_delay", "arr_flights"],
+    }
     
     def __init__(self, config):
         """
@@ -23,6 +31,7 @@ class Permutations_Combination_Calculator(AdvanceCalculations):
         """
         super().__init__(config)
         self.output_folder = "Output"
+        self.engine = CombinatoricsEngine()
 
     def calculate_permutation(self, *args, **kwargs):
         """
@@ -30,22 +39,23 @@ class Permutations_Combination_Calculator(AdvanceCalculations):
         
         Args:
         - *args: Accepts n, r as positional arguments
-        - **kwargs: Accepts named arguments (n=value, r=value)
+        - **kwargs: Accepts named arguments (n=value, r=value, log_space=bool)
         
         Returns:
-        - Number of possible permutations
+        - Number of possible permutations (natural log if log_space=True)
         """
         if len(args) == 2:
             n, r = args
         else:
             n = kwargs.get('n')
             r = kwargs.get('r')
+        log_space = kwargs.get('log_space', False)
             
         if n < r:
             raise ValueError("n must be greater than or equal to r")
         
-        result = self.factorial(n) // self.factorial(n - r)
-        self._save_result("permutation", n, r, result)
+        result = self.engine.permutation(n, r, log_space=log_space)
+        self._save_result(self._result_type("permutation", log_space), n, r, result)
         return result
 
     def calculate_combination(self, *args, **kwargs):
@@ -54,22 +64,23 @@ class Permutations_Combination_Calculator(AdvanceCalculations):
         
         Args:
         - *args: Accepts n, r as positional arguments
-        - **kwargs: Accepts named arguments (n=value, r=value)
+        - **kwargs: Accepts named arguments (n=value, r=value, log_space=bool)
         
         Returns:
-        - Number of possible combinations
+        - Number of possible combinations (natural log if log_space=True)
         """
         if len(args) == 2:
             n, r = args
         else:
             n = kwargs.get('n')
             r = kwargs.get('r')
+        log_space = kwargs.get('log_space', False)
             
         if n < r:
             raise ValueError("n must be greater than or equal to r")
         
-        result = self.factorial(n) // (self.factorial(r) * self.factorial(n - r))
-        self._save_result("combination", n, r, result)
+        result = self.engine.combination(n, r, log_space=log_space)
+        self._save_result(self._result_type("combination", log_space), n, r, result)
         return result
 
     def calculate_permutation_with_repetition(self, *args, **kwargs):
@@ -78,19 +89,20 @@ class Permutations_Combination_Calculator(AdvanceCalculations):
         
         Args:
         - *args: Accepts n, r as positional arguments
-        - **kwargs: Accepts named arguments (n=value, r=value)
+        - **kwargs: Accepts named arguments (n=value, r=value, log_space=bool)
         
         Returns:
-        - Number of possible permutations with repetition
+        - Number of possible permutations with repetition (natural log if log_space=True)
         """
         if len(args) == 2:
             n, r = args
         else:
             n = kwargs.get('n')
             r = kwargs.get('r')
+        log_space = kwargs.get('log_space', False)
             
-        result = n ** r
-        self._save_result("permutation_with_repetition", n, r, result)
+        result = self.engine.permutation_with_repetition(n, r, log_space=log_space)
+        self._save_result(self._result_type("permutation_with_repetition", log_space), n, r, result)
         return result
 
     def get_unique_values_count(self, column):
@@ -113,19 +125,20 @@ class Permutations_Combination_Calculator(AdvanceCalculations):
         
         Args:
         - *args: Accepts n, r as positional arguments
-        - **kwargs: Accepts named arguments (n=value, r=value)
+        - **kwargs: Accepts named arguments (n=value, r=value, log_space=bool)
         
         Returns:
-        - Number of possible combinations with repetition
+        - Number of possible combinations with repetition (natural log if log_space=True)
         """
         if len(args) == 2:
             n, r = args
         else:
             n = kwargs.get('n')
             r = kwargs.get('r')
+        log_space = kwargs.get('log_space', False)
             
-        result = self.factorial(n + r - 1) // (self.factorial(r) * self.factorial(n - 1))
-        self._save_result("combination_with_repetition", n, r, result)
+        result = self.engine.combination_with_repetition(n, r, log_space=log_space)
+        self._save_result(self._result_type("combination_with_repetition", log_space), n, r, result)
         return result
 
     def calculate_circular_permutation(self, *args, **kwargs):
@@ -134,18 +147,19 @@ class Permutations_Combination_Calculator(AdvanceCalculations):
         
         Args:
         - *args: Accepts n as positional argument
-        - **kwargs: Accepts named argument (n=value)
+        - **kwargs: Accepts named arguments (n=value, log_space=bool)
         
         Returns:
-        - Number of possible circular permutations
+        - Number of possible circular permutations (natural log if log_space=True)
         """
         n = args[0] if args else kwargs.get('n')
+        log_space = kwargs.get('log_space', False)
         
         if n < 1:
             raise ValueError("n must be at least 1")
             
-        result = self.factorial(n - 1)
-        self._save_result("circular_permutation", n, None, result)
+        result = self.engine.circular_permutation(n, log_space=log_space)
+        self._save_result(self._result_type("circular_permutation", log_space), n, None, result)
         return result
 
     def analyze_column_combinations(self, *args, **kwargs):
@@ -172,42 +186,276 @@ class Permutations_Combination_Calculator(AdvanceCalculations):
             "Column": column,
             "Unique_Values": unique_values,
             "Combination_Size": r,
-            "Simple_Combinations": self.calculate_combination(unique_values, r),
-            "Combinations_With_Repetition": self.calculate_combination_with_repetition(unique_values, r)
+            "Simple_Combinations": self.engine.combination(unique_values, r),
+            "Combinations_With_Repetition": self.engine.combination_with_repetition(unique_values, r)
         }
+        for calculation_type, key in (("combination", "Simple_Combinations"),
+                                      ("combination_with_repetition", "Combinations_With_Repetition")):
+            self.result_collector.record(type(self).__name__, calculation_type,
+                                         self.engine.format_result(results[key]),
+                                         n=unique_values, r=r, column=column)
         
         results_df = pd.DataFrame([results])
-        self.save_to_output(f"{column}_combination_analysis.csv", results_df)
         return results_df
 
+    def calculate_batch(self, *args, **kwargs):
+        """
+        Calculate one combinatorics quantity for every (n, r) pair of two arrays.
+
+        Every n is crossed with every r and evaluated in one vectorized call
+        (log space) or with exact integers, then written to a single file.
+        
+        Args:
+        - *args: Accepts calculation_type, n_values, r_values as positional arguments
+        - **kwargs: Accepts named arguments (calculation_type=..., n_values=..., r_values=...,
+          exact=bool, name=str for the output file)
+        
+        Returns:
+        - DataFrame with one row per (n, r) pair
+        """
+        if len(args) == 3:
+            calculation_type, n_values, r_values = args
+        else:
+            calculation_type = kwargs.get('calculation_type')
+            n_values = kwargs.get('n_values')
+            r_values = kwargs.get('r_values')
+        exact = kwargs.get('exact', False)
+        name = kwargs.get('name', f"{calculation_type}_batch")
+
+        n_grid, r_grid = np.meshgrid(np.asarray(n_values), np.asarray(r_values), indexing="ij")
+        results_df = pd.DataFrame({
+            "Calculation_Type": calculation_type,
+            "n": n_grid.ravel(),
+            "r": r_grid.ravel(),
+        })
+        self._add_batch_results(results_df, calculation_type, "Result", exact)
+        self.save_to_output(f"{name}.csv", results_df)
+        return results_df
+
+    def analyze_all_column_combinations(self, *args, **kwargs):
+        """
+        Analyze combinations of unique values for many columns in one table.
+
+        The unique-value count of every column is crossed with r = 1..max_r and
+        all quantities are computed in batch, replacing one
+        analyze_column_combinations call (and its files) per column.
+        
+        Args:
+        - *args: Accepts max_r as positional argument
+        - **kwargs: Accepts named arguments (max_r=value, columns=list, exact=bool);
+          columns defaults to all categorical columns
+        
+        Returns:
+        - DataFrame with one row per (column, r) pair
+        """
+        max_r = args[0] if args else kwargs.get('max_r', 3)
+        columns = kwargs.get('columns')
+        exact = kwargs.get('exact', False)
+
+        if self.data is None or self.data.empty:
+            raise ValueError("Dataset is not loaded or is empty.")
+        if columns is None:
+            columns = list(self.data.select_dtypes(include=['object', 'category']).columns)
+        for column in columns:
+            self.validate_column(column)
+
+        unique_counts = np.array([self.data[column].nunique() for column in columns], dtype=np.int64)
+        r_values = np.arange(1, max_r + 1)
+        column_index, r_grid = np.meshgrid(np.arange(len(columns)), r_values, indexing="ij")
+        results_df = pd.DataFrame({
+            "Column": np.asarray(columns, dtype=object)[column_index.ravel()],
+            "Unique_Values": unique_counts[column_index.ravel()],
+            "Combination_Size": r_grid.ravel(),
+        })
+        n_values = results_df["Unique_Values"].to_numpy()
+        r_values = results_df["Combination_Size"].to_numpy()
+        for calculation_type, label in (("permutation", "Permutations"),
+                                        ("combination", "Simple_Combinations"),
+                                        ("combination_with_repetition", "Combinations_With_Repetition")):
+            self._add_batch_results(results_df, calculation_type, label, exact, n_values, r_values)
+
+        self.save_to_output("all_columns_combination_analysis.csv", results_df)
+        return results_df
+
+    def _add_batch_results(self, results_df, calculation_type, label, exact, n_values=None, r_values=None):
+        """
+        Add batch results for one calculation type as columns of results_df.
+
+        Exact runs add the integer result; log-space runs add natural-log and
+        base-10 magnitude columns.
+        """
+        if n_values is None:
+            n_values = results_df["n"].to_numpy()
+            r_values = results_df["r"].to_numpy()
+        if exact:
+            values = self.engine.batch(calculation_type, n_values, r_values, log_space=False)
+            results_df[label] = [self.engine.format_result(value) for value in values]
+        else:
+            log_values = self.engine.batch(calculation_type, n_values, r_values, log_space=True)
+            results_df[f"Log_{label}"] = log_values
+            results_df[f"Log10_{label}"] = log_values / np.log(10)
+
     def calculate_permutations_from_frequencies(self, *args, **kwargs):
         """
         Calculate permutations when items have repetitions.
         
         Args:
         - *args: Accepts frequencies as positional argument
-        - **kwargs: Accepts frequencies as named argument
+        - **kwargs: Accepts frequencies (and log_space=bool) as named arguments
         
         Returns:
-        - Number of unique permutations
+        - Number of unique permutations (natural log if log_space=True)
         """
         frequencies = args[0] if args else kwargs.get('frequencies')
+        log_space = kwargs.get('log_space', False)
         
         if isinstance(frequencies, dict):
             frequencies = list(frequencies.values())
+        elif isinstance(frequencies, pd.Series):
+            frequencies = frequencies.tolist()
             
         total_items = sum(frequencies)
-        denominator = 1
-        for freq in frequencies:
-            denominator *= self.factorial(freq)
-            
-        result = self.factorial(total_items) // denominator
-        self._save_result("permutation_with_frequencies", total_items, None, result)
+        result = self.engine.multinomial(frequencies, log_space=log_space)
+        self._save_result(self._result_type("permutation_with_frequencies", log_space), total_items, None, result)
+        return result
+
+    def get_group_aggregates(self, *args, **kwargs):
+        """
+        Aggregate a value and a weight column per unique value of a column in one pass.
+
+        The row order of the result defines the integer codes used by
+        iter_combinations, so code i always refers to row i.
+        
+        Args:
+        - *args: Accepts column as positional argument
+        - **kwargs: Accepts named arguments (column=..., value_column='arr_delay',
+          weight_column='arr_flights', values=list restricting and ordering the groups)
+        
+        Returns:
+        - DataFrame indexed by group with Value_Sum, Value_Count and Weight_Sum columns
+        """
+        column = args[0] if args else kwargs.get('column')
+        value_column = kwargs.get('value_column', 'arr_delay')
+        weight_column = kwargs.get('weight_column', 'arr_flights')
+        values = kwargs.get('values')
+
+        for name in (column, value_column, weight_column):
+            self.validate_column(name)
+
+        categories = values if values is not None else np.sort(self.data[column].dropna().unique())
+        codes = pd.Categorical(self.data[column], categories=categories).codes
+        in_groups = codes >= 0
+        codes = codes[in_groups]
+        group_values = self.data[value_column].to_numpy(dtype=float)[in_groups]
+        group_weights = self.data[weight_column].to_numpy(dtype=float)[in_groups]
+        has_value = ~np.isnan(group_values)
+        n_groups = len(categories)
+
+        return pd.DataFrame({
+            "Value_Sum": np.bincount(codes, weights=np.where(has_value, group_values, 0.0), minlength=n_groups),
+            "Value_Count": np.bincount(codes, weights=has_value, minlength=n_groups),
+            "Weight_Sum": np.bincount(codes, weights=np.nan_to_num(group_weights), minlength=n_groups),
+        }, index=pd.Index(categories, name=column))
+
+    def iter_combinations(self, *args, **kwargs):
+        """
+        Lazily enumerate r-combinations of group codes in chunks.
+
+        Combinations are generated in lexicographic order and never materialized
+        all at once; each chunk is an integer array of shape (chunk rows, r).
+        
+        Args:
+        - *args: Accepts n_groups, r as positional arguments
+        - **kwargs: Accepts named arguments (n_groups=..., r=..., chunk_size=10000)
+        
+        Yields:
+        - int64 arrays of group codes, one combination per row
+        """
+        if len(args) == 2:
+            n_groups, r = args
+        else:
+            n_groups = kwargs.get('n_groups')
+            r = kwargs.get('r')
+        chunk_size = kwargs.get('chunk_size', 10000)
+
+        if r < 1 or n_groups < r:
+            raise ValueError("r must be between 1 and the number of groups")
+
+        combination_iter = combinations(range(n_groups), r)
+        while True:
+            chunk = np.fromiter(chain.from_iterable(islice(combination_iter, chunk_size)), dtype=np.int64)
+            if chunk.size == 0:
+                return
+            yield chunk.reshape(-1, r)
+
+    def evaluate_combination_chunk(self, codes, aggregates):
+        """
+        Compute delay comparisons for a chunk of combinations, vectorized across rows.
+        
+        Args:
+        - codes: int array of shape (m, r) from iter_combinations
+        - aggregates: DataFrame from get_group_aggregates
+        
+        Returns:
+        - DataFrame with the member labels and, per combination, the spread of group
+          mean values (the signed mean difference for pairs) and the combined ratio
+          of value to weight (e.g. delay minutes per flight)
+        """
+        value_sum = aggregates["Value_Sum"].to_numpy()[codes]
+        value_count = aggregates["Value_Count"].to_numpy()[codes]
+        weight_sum = aggregates["Weight_Sum"].to_numpy()[codes]
+        labels = aggregates.index.to_numpy()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = value_sum / value_count
+            combined_ratio = value_sum.sum(axis=1) / weight_sum.sum(axis=1)
+
+        result = pd.DataFrame({f"Member_{i + 1}": labels[codes[:, i]] for i in range(codes.shape[1])})
+        if codes.shape[1] == 2:
+            result["Mean_Difference"] = means[:, 0] - means[:, 1]
+        result["Mean_Spread"] = means.max(axis=1) - means.min(axis=1)
+        result["Combined_Delay_Ratio"] = combined_ratio
         return result
 
+    def iter_combination_analytics(self, *args, **kwargs):
+        """
+        Stream per-combination delay comparisons for r-subsets of a column's values.
+
+        Group sums are computed once; every chunk of combinations then costs only
+        array indexing and arithmetic.
+        
+        Args:
+        - *args: Accepts column, r as positional arguments
+        - **kwargs: Accepts named arguments (column=..., r=..., value_column='arr_delay',
+          weight_column='arr_flights', values=list of groups to combine, chunk_size=10000)
+        
+        Yields:
+        - DataFrame per chunk, as returned by evaluate_combination_chunk
+        """
+        if len(args) == 2:
+            column, r = args
+        else:
+            column = kwargs.get('column')
+            r = kwargs.get('r')
+
+        aggregates = self.get_group_aggregates(
+            column,
+            value_column=kwargs.get('value_column', 'arr_delay'),
+            weight_column=kwargs.get('weight_column', 'arr_flights'),
+            values=kwargs.get('values'))
+        for codes in self.iter_combinations(len(aggregates), r, chunk_size=kwargs.get('chunk_size', 10000)):
+            yield self.evaluate_combination_chunk(codes, aggregates)
+
+    def _result_type(self, calculation_type, log_space):
+        """Label log-space results so they are not mistaken for exact counts."""
+        return f"log_{calculation_type}" if log_space else calculation_type
+
     def _save_result(self, calculation_type, n, r, result):
         """
-        Save calculation result to output file.
+        Record calculation result in the session result collector.
+        
+        Results are buffered and flushed to one consolidated file instead of
+        writing one CSV per calculation.
         
         Args:
         - calculation_type: Type of calculation performed
@@ -215,16 +463,8 @@ class Permutations_Combination_Calculator(AdvanceCalculations):
         - r: Second parameter of calculation (if applicable)
         - result: Calculated result
         """
-        result_data = {
-            "Calculation_Type": [calculation_type],
-            "n": [n],
-            "r": [r] if r is not None else [None],
-            "Result": [result]
-        }
-        
-        result_df = pd.DataFrame(result_data)
-        filename = f"{calculation_type}_n{n}" + (f"_r{r}" if r is not None else "") + ".csv"
-        self.save_to_output(filename, result_df)
+        self.result_collector.record(type(self).__name__, calculation_type,
+                                     self.engine.format_result(result), n=n, r=r)
 
     def save_to_output(self, filename, result):
         """
@@ -0,0 +1,153 @@
+#%% MODULE BEGINS
+# module_name = "plot_cache.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import hashlib
+import json
+import os
+import shutil
+import time
+
+# Third-Party Library Imports
+import matplotlib.pyplot as plt
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Bump when plotting code changes so images rendered by older code are not reused
+PLOT_CACHE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+# Backends that only write files; cached images are not displayed under them
+NON_INTERACTIVE_BACKENDS = ("agg", "cairo", "pdf", "pgf", "ps", "svg", "template")
+
+
+#%% FUNCTION DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def style_fingerprint():
+    """Hash of the active matplotlib/seaborn style (all rcParams)."""
+    items = sorted((key, str(value)) for key, value in plt.rcParams.items())
+    return hashlib.sha1(repr(items).encode("utf-8")).hexdigest()
+
+
+def show_image(image_file):
+    """
+    Display a saved plot image in a window, as plt.show() shows a fresh render.
+
+    Does nothing under non-interactive backends (e.g. Agg in the analysis service).
+    """
+    if plt.get_backend().lower() in NON_INTERACTIVE_BACKENDS:
+        return
+    image = plt.imread(image_file)
+    dpi = plt.rcParams["figure.dpi"]
+    figure = plt.figure(figsize=(image.shape[1] / dpi, image.shape[0] / dpi), dpi=dpi)
+    # Place the pixels as saved, without axes or resampling
+    figure.figimage(image)
+    plt.show()
+    plt.close(figure)
+
+
+#%% CLASS DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class PlotCache:
+    """
+    Content-addressed cache of rendered plot images.
+
+    Features:
+    - Keys hash the plot type, its parameters, the dataset fingerprint and the style.
+    - Rendered images are kept under '<output>/.plot_cache/<key>.png'; on a hit the
+      image is copied to its usual output name instead of being re-rendered.
+    - A JSON manifest records size and last use; least recently used images are
+      evicted beyond max_entries or max_bytes.
+    """
+
+    def __init__(self, output_folder="Output", max_entries=500, max_bytes=512 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+        - output_folder: Folder plots are written to
+        - max_entries: Maximum number of cached images
+        - max_bytes: Maximum total size of cached images
+        """
+        self.output_folder = output_folder
+        self.cache_folder = os.path.join(output_folder, ".plot_cache")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.manifest = None  # key -> {"size", "last_used"}; read on first use
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(plot_type, params, data_fingerprint, style=None):
+        """Build the cache key of a plot."""
+        payload = json.dumps({
+            "version": PLOT_CACHE_VERSION,
+            "type": plot_type,
+            "params": params,
+            "data": data_fingerprint,
+            "style": style or style_fingerprint(),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _manifest_path(self):
+        return os.path.join(self.cache_folder, MANIFEST_FILE)
+
+    def _load_manifest(self):
+        if self.manifest is None:
+            try:
+                with open(self._manifest_path(), "r", encoding="utf-8") as file:
+                    self.manifest = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self.manifest = {}
+        return self.manifest
+
+    def _save_manifest(self):
+        os.makedirs(self.cache_folder, exist_ok=True)
+        with open(self._manifest_path(), "w", encoding="utf-8") as file:
+            json.dump(self.manifest, file)
+
+    def _image_path(self, key):
+        return os.path.join(self.cache_folder, f"{key}.png")
+
+    def fetch(self, key, output_file):
+        """
+        Place the cached image for key at output_file.
+
+        Returns:
+        - True on a hit, False if the plot has to be rendered
+        """
+        manifest = self._load_manifest()
+        image = self._image_path(key)
+        if key not in manifest or not os.path.exists(image):
+            manifest.pop(key, None)
+            self.stats["misses"] += 1
+            return False
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        shutil.copyfile(image, output_file)
+        manifest[key]["last_used"] = time.time()
+        self._save_manifest()
+        self.stats["hits"] += 1
+        return True
+
+    def store(self, key, output_file):
+        """Add a freshly rendered image to the cache and apply the eviction policy."""
+        manifest = self._load_manifest()
+        os.makedirs(self.cache_folder, exist_ok=True)
+        shutil.copyfile(output_file, self._image_path(key))
+        manifest[key] = {"size": os.path.getsize(output_file), "last_used": time.time()}
+        self._evict()
+        self._save_manifest()
+
+    def _evict(self):
+        """Remove least recently used images beyond max_entries or max_bytes."""
+        total = sum(entry["size"] for entry in self.manifest.values())
+        for key in sorted(self.manifest, key=lambda k: self.manifest[k]["last_used"]):
+            if len(self.manifest) <= self.max_entries and total <= self.max_bytes:
+                break
+            total -= self.manifest.pop(key)["size"]
+            if os.path.exists(self._image_path(key)):
+                os.remove(self._image_path(key))
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """Remove every cached image."""
+        shutil.rmtree(self.cache_folder, ignore_errors=True)
+        self.manifest = {}
@@ -21,7 +21,7 @@ class ProbabilityCalculations(AdvanceCalculations):
     Features:
     - Calculates mean, median, and standard deviation and saves results.
     - Computes joint probabilities and conditional probabilities for all combinations.
-    - Calculates and saves weighted mean.
+    - Calculates weighted mean and records it in the session result collector.
     """
     def __init__(self, config):
         """
@@ -43,21 +43,25 @@ class ProbabilityCalculations(AdvanceCalculations):
             print(f"Loaded mean of column '{column}' from pickle: {mean_value}")
         else:
             print(f"Mean not found in pickle. Calculating mean for column '{column}'.")
-            mean_value = self.data[column].mean()
+            mean_value = self.reduce_column(column, 'mean')
             # Save to pickle
             self.save_stats_to_pickle(column, 'mean', mean_value)
         return mean_value
 
-    def calculate_median(self, column):
+    def calculate_median(self, column, approximate=False):
         """
         Calculate the median using saved pickle data if available, otherwise calculate, save, and return it.
+        With approximate=True the median comes from the quantile sketch index instead.
         """
+        if approximate:
+            return super().calculate_median(column, approximate=True)
         # Attempt to load the median from the pickle file
         median_value = self.load_stats_from_pickle(column, 'median')
         if median_value is not None:
             print(f"Loaded median of column '{column}' from pickle: {median_value}")
         else:
             print(f"Median not found in pickle. Calculating median for column '{column}'.")
+            self.validate_column(column)
             median_value = self.data[column].median()
             # Save to pickle
             self.save_stats_to_pickle(column, 'median', median_value)
@@ -73,14 +77,14 @@ class ProbabilityCalculations(AdvanceCalculations):
             print(f"Loaded standard deviation of column '{column}' from pickle: {std_value}")
         else:
             print(f"Standard deviation not found in pickle. Calculating standard deviation for column '{column}'.")
-            std_value = self.data[column].std()
+            std_value = self.reduce_column(column, 'std')
             # Save to pickle
             self.save_stats_to_pickle(column, 'std', std_value)
         return std_value
 
     def calculate_weighted_mean(self, column, weights_column):
         """
-        Calculate the weighted mean using lambda function and save the result.
+        Calculate the weighted mean using lambda function and record the result.
         """
         if self.data is None or self.data.empty:
             raise ValueError("Data is not loaded or is empty.")
@@ -93,14 +97,8 @@ class ProbabilityCalculations(AdvanceCalculations):
             weighted_mean_func = lambda v, w: (v * w).sum() / w.sum()
             weighted_mean = weighted_mean_func(self.data[column], self.data[weights_column])
 
-            result_data = pd.DataFrame({
-                "Statistic": ["Weighted Mean"],
-                "Column": [column],
-                "Weights Column": [weights_column],
-                "Value": [weighted_mean]
-            })
-
-            self.save_to_output(f"{column}_weighted_mean.csv", result_data)
+            self.result_collector.record(type(self).__name__, "weighted_mean", weighted_mean,
+                                         column=column, weights_column=weights_column)
             return weighted_mean
         except Exception as e:
             raise ValueError(f"Error calculating weighted mean: {e}")
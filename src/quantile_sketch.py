@@ -0,0 +1,207 @@
+#%% MODULE BEGINS
+# module_name = "quantile_sketch.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import hashlib
+import os
+import pickle
+
+# Third-Party Library Imports
+import numpy as np
+import pandas as pd
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+DEFAULT_K = 200
+CAPACITY_DECAY = 2 / 3  # Each lower level holds 2/3 of the items of the level above
+
+
+#%% FUNCTION DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def normalized_rank_error(k):
+    """
+    Rank error of a single KLL quantile query, as a fraction of n, at 99% confidence.
+
+    Empirical fit used by the Apache DataSketches KLL implementation (k=200 -> ~1.33%).
+    """
+    return 2.296 / k ** 0.9723
+
+
+def dataset_fingerprint(data):
+    """Content hash of a DataFrame (values, columns and shape), computed in one vectorized pass."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    digest.update(repr((data.shape, list(data.columns))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+#%% CLASS DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class KLLSketch:
+    """
+    KLL quantile sketch.
+
+    Values are kept in levels of compactors; an item at level h stands for 2**h input
+    values. When the sketch exceeds its capacity, the lowest full level is sorted and
+    every other item (random offset) is promoted. Memory is O(k log(n/k)), and any
+    quantile has rank error within normalized_rank_error(k) * n with 99% confidence.
+    Until the first compaction the sketch holds every value and answers exactly.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=0):
+        """
+        Initialize an empty sketch.
+
+        Args:
+        - k: Accuracy parameter (size of the top level)
+        - seed: Seed for the compaction offsets
+        """
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def is_exact(self):
+        """True while no compaction has happened (all values are stored)."""
+        return len(self.levels) == 1
+
+    @property
+    def rank_error(self):
+        """Normalized rank error bound of quantile queries (0 while exact)."""
+        return 0.0 if self.is_exact else normalized_rank_error(self.k)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * CAPACITY_DECAY ** depth)))
+
+    def update(self, values):
+        """Add a batch of values (NaN values are ignored)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Merge another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        while sum(len(items) for items in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            level = next(h for h in range(len(self.levels)) if len(self.levels[h]) > self._capacity(h))
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            # An odd item out stays at this level
+            leftover, items = (items[-1:], items[:-1]) if len(items) % 2 else (items[:0], items)
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[self.rng.integers(2)::2]])
+            self.levels[level] = leftover
+
+    def quantiles(self, quantiles):
+        """
+        Approximate quantiles (exact, with linear interpolation, while the sketch is exact).
+
+        Args:
+        - quantiles: Iterable of quantiles in [0, 1]
+
+        Returns:
+        - Array of values (NaN for an empty sketch)
+        """
+        quantiles = np.asarray(quantiles, dtype=float)
+        if self.n == 0:
+            return np.full(quantiles.shape, np.nan)
+        if self.is_exact:
+            return np.quantile(self.levels[0], quantiles)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_h), 2.0 ** h) for h, items_h in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, quantiles * cumulative[-1], side="left")
+        return items[order][np.minimum(positions, len(items) - 1)]
+
+
+class QuantileSketchIndex:
+    """
+    Per-column, per-group KLL sketches persisted with a dataset fingerprint.
+
+    Features:
+    - Each (column, group column) pair is sketched in one pass: rows are sorted by
+      group once and every group's slice feeds its own sketch.
+    - Medians and percentiles per group come from the sketches without touching the data.
+    - Saved to disk with the dataset fingerprint; a stale file (different data) is ignored.
+    """
+    OVERALL = "__all__"  # Group column key for whole-column sketches
+
+    def __init__(self, fingerprint, k=DEFAULT_K, seed=0):
+        """
+        Initialize an empty index.
+
+        Args:
+        - fingerprint: Fingerprint of the dataset the sketches describe
+        - k: Accuracy parameter of every sketch
+        - seed: Seed for the sketch compactions
+        """
+        self.fingerprint = fingerprint
+        self.k = k
+        self.seed = seed
+        self.sketches = {}  # (column, group column) -> {group label: KLLSketch}
+
+    def __contains__(self, key):
+        column, group_column = key
+        return (column, group_column or self.OVERALL) in self.sketches
+
+    def build(self, data, column, group_column=None):
+        """Sketch a column overall (group_column=None) or for every group of group_column."""
+        values = data[column].to_numpy(dtype=float)
+        if group_column is None:
+            sketches = {self.OVERALL: KLLSketch(self.k, self.seed).update(values)}
+        else:
+            codes, labels = pd.factorize(data[group_column], sort=True)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            sorted_values = values[order]
+            sketches = {label: KLLSketch(self.k, self.seed).update(sorted_values[start:stop])
+                        for label, start, stop in zip(labels, bounds[:-1], bounds[1:])}
+        self.sketches[(column, group_column or self.OVERALL)] = sketches
+        return sketches
+
+    def quantiles(self, column, quantiles, group_column=None):
+        """
+        Quantiles of a column overall or per group.
+
+        Returns:
+        - DataFrame indexed by group (or a single 'All' row) with one column per quantile
+          and the 'Rank Error' bound of each row
+        """
+        sketches = self.sketches[(column, group_column or self.OVERALL)]
+        labels = ["All" if label == self.OVERALL else label for label in sketches]
+        result = pd.DataFrame([sketch.quantiles(quantiles) for sketch in sketches.values()],
+                              index=pd.Index(labels, name=group_column), columns=list(quantiles))
+        result["Rank Error"] = [sketch.rank_error for sketch in sketches.values()]
+        return result
+
+    def save(self, filepath):
+        """Persist the index with its fingerprint."""
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        with open(filepath, "wb") as file:
+            pickle.dump(self, file)
+
+    @classmethod
+    def load(cls, filepath, fingerprint):
+        """Load a persisted index; returns None if missing or built for different data."""
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, "rb") as file:
+            index = pickle.load(file)
+        return index if isinstance(index, cls) and index.fingerprint == fingerprint else None
@@ -0,0 +1,151 @@
+#%% MODULE BEGINS
+# module_name = "query_cache.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import numbers
+from collections import OrderedDict
+
+# Third-Party Library Imports
+import numpy as np
+
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# For each new condition: cached conditions whose result is a superset,
+# given a test on (new value, cached value).
+SUPERSET_RULES = {
+    ">": {">": lambda v, c: v >= c, ">=": lambda v, c: v >= c},
+    ">=": {">": lambda v, c: v > c, ">=": lambda v, c: v >= c},
+    "<": {"<": lambda v, c: v <= c, "<=": lambda v, c: v <= c},
+    "<=": {"<": lambda v, c: v < c, "<=": lambda v, c: v <= c},
+    "==": {">": lambda v, c: v > c, ">=": lambda v, c: v >= c,
+           "<": lambda v, c: v < c, "<=": lambda v, c: v <= c},
+}
+
+
+class QueryCache:
+    """
+    Memory-bounded LRU cache of query results stored as row-position arrays.
+
+    Features:
+    - Keys are normalized predicates (column, condition, value) plus the dataset version,
+      so results from an older version of the data are never returned.
+    - Stores row positions instead of DataFrame copies.
+    - Tighter predicates on a cached column (e.g. '> 60' after '> 15') are answered by
+      refining the cached superset instead of rescanning the column.
+    - Records hits, misses, refinements and evictions.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+        - max_bytes: Upper bound on the memory used by cached row arrays
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> row positions
+        self.by_column = {}  # (version, column) -> set of keys, for superset search
+        self.nbytes = 0
+        self.stats = {"hits": 0, "misses": 0, "refinements": 0, "evictions": 0}
+
+    @staticmethod
+    def normalize(condition, value):
+        """Normalize a predicate value so equivalent queries share one key (10 == 10.0)."""
+        if isinstance(value, numbers.Real) and not isinstance(value, bool):
+            return condition.strip(), float(value)
+        if isinstance(value, str):
+            return condition.strip(), value.strip()
+        return condition.strip(), value
+
+    def make_key(self, version, column, condition, value):
+        """Build the cache key of a predicate on a given dataset version."""
+        condition, value = self.normalize(condition, value)
+        return version, column, condition, value
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups answered from the cache (exactly or by refinement)."""
+        answered = self.stats["hits"] + self.stats["refinements"]
+        total = answered + self.stats["misses"]
+        return answered / total if total else 0.0
+
+    def lookup(self, key):
+        """
+        Look up a predicate.
+
+        Returns:
+        - tuple: ('hit', row positions) for an exact match, ('refine', superset row
+          positions) when a cached superset can be filtered, or ('miss', None)
+        """
+        rows = self.entries.get(key)
+        if rows is not None:
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return "hit", rows
+        rows = self.find_superset(key)
+        if rows is not None:
+            self.stats["refinements"] += 1
+            return "refine", rows
+        self.stats["misses"] += 1
+        return "miss", None
+
+    def find_superset(self, key):
+        """
+        Return the smallest cached row array whose predicate contains key's predicate.
+
+        Only numeric range/equality predicates on the same column and data version qualify.
+        """
+        version, column, condition, value = key
+        rules = SUPERSET_RULES.get(condition)
+        if rules is None or not isinstance(value, float) or np.isnan(value):
+            return None
+
+        best = None
+        for cached_key in self.by_column.get((version, column), ()):
+            cached_condition, cached_value = cached_key[2], cached_key[3]
+            test = rules.get(cached_condition)
+            if test is None or not isinstance(cached_value, float) or not test(value, cached_value):
+                continue
+            rows = self.entries[cached_key]
+            if best is None or len(rows) < len(best[1]):
+                best = (cached_key, rows)
+
+        if best is None:
+            return None
+        self.entries.move_to_end(best[0])
+        return best[1]
+
+    def put(self, key, rows):
+        """Store row positions for key, evicting least recently used entries if needed."""
+        rows = np.asarray(rows)
+        if rows.nbytes > self.max_bytes:
+            return
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = rows
+        self.by_column.setdefault(key[:2], set()).add(key)
+        self.nbytes += rows.nbytes
+        while self.nbytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.stats["evictions"] += 1
+
+    def invalidate_column(self, column):
+        """Drop all entries for a column (e.g. after the column was rewritten in place)."""
+        for key in [key for key in self.entries if key[1] == column]:
+            self._remove(key)
+
+    def clear(self):
+        """Drop all entries."""
+        for key in list(self.entries):
+            self._remove(key)
+
+    def _remove(self, key):
+        rows = self.entries.pop(key)
+        self.nbytes -= rows.nbytes
+        keys = self.by_column.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.by_column[key[:2]]
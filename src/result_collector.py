@@ -0,0 +1,152 @@
+#%% MODULE BEGINS
+# module_name = "result_collector.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import atexit
+import os
+import weakref
+from datetime import datetime
+
+# Third-Party Library Imports
+import pandas as pd
+
+#%% CONSTANTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Collectors to flush at interpreter exit; weak, so discarded collectors are not kept alive
+_EXIT_COLLECTORS = weakref.WeakSet()
+
+
+#%% FUNCTION DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def _flush_at_exit():
+    """Flush every collector still alive when the interpreter exits."""
+    for collector in list(_EXIT_COLLECTORS):
+        collector.flush()
+
+
+atexit.register(_flush_at_exit)
+
+
+#%% CLASS DEFINITIONS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ResultCollector:
+    """
+    Accumulates scalar results of a session and writes them to one consolidated file.
+
+    Features:
+    - Records are appended to an in-memory columnar buffer (one list per column).
+    - The buffer is flushed to a single appendable results file at checkpoints,
+      when it reaches flush_every rows, and on interpreter exit.
+    - CSV output appends to one file; Parquet output writes one part file per flush
+      into a results directory (requires pyarrow).
+    """
+    COLUMNS = ("Session", "Recorded_At", "Source", "Calculation_Type", "n", "r", "Parameters", "Result")
+
+    def __init__(self, output_folder="Output", filename="session_results", file_format="csv",
+                 flush_every=1000, flush_on_exit=True):
+        """
+        Initialize the collector.
+
+        Args:
+        - output_folder: Folder that holds the consolidated results file.
+        - filename: Base name of the results file (without extension).
+        - file_format: 'csv' or 'parquet'.
+        - flush_every: Flush automatically once this many records are buffered.
+        - flush_on_exit: Flush buffered records when the interpreter exits, or earlier
+          if the collector is discarded.
+        """
+        if file_format not in ("csv", "parquet"):
+            raise ValueError("file_format must be 'csv' or 'parquet'.")
+        self.output_folder = output_folder
+        self.filename = filename
+        self.file_format = file_format
+        self.flush_every = flush_every
+        self.flush_on_exit = flush_on_exit
+        self.session_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.flush_count = 0
+        self.buffer = {column: [] for column in self.COLUMNS}
+        if flush_on_exit:
+            _EXIT_COLLECTORS.add(self)
+
+    def __del__(self):
+        # A collector discarded before exit still writes its buffered records
+        if getattr(self, "flush_on_exit", False) and hasattr(self, "buffer"):
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    def __len__(self):
+        """Number of buffered (unflushed) records."""
+        return len(self.buffer["Result"])
+
+    @property
+    def output_path(self):
+        """Path of the consolidated CSV file, or of the Parquet part directory."""
+        if self.file_format == "csv":
+            return os.path.join(self.output_folder, f"{self.filename}.csv")
+        return os.path.join(self.output_folder, self.filename)
+
+    def record(self, source, calculation_type, result, n=None, r=None, **parameters):
+        """
+        Buffer one result.
+
+        Args:
+        - source: Name of the class or module that produced the result.
+        - calculation_type: Type of calculation performed.
+        - result: Calculated scalar value.
+        - n: First parameter of the calculation (if applicable).
+        - r: Second parameter of the calculation (if applicable).
+        - **parameters: Any other parameters (e.g. column names), stored as 'key=value' pairs.
+        """
+        row = (
+            self.session_id,
+            datetime.now().isoformat(timespec="seconds"),
+            source,
+            calculation_type,
+            n,
+            r,
+            ";".join(f"{key}={value}" for key, value in parameters.items()),
+            result,
+        )
+        for column, value in zip(self.COLUMNS, row):
+            self.buffer[column].append(value)
+
+        if self.flush_every and len(self) >= self.flush_every:
+            self.flush()
+
+    def to_dataframe(self):
+        """Return the buffered records as a DataFrame without flushing them."""
+        return pd.DataFrame(self.buffer, columns=list(self.COLUMNS), dtype=object)
+
+    def flush(self):
+        """
+        Write buffered records to the consolidated results file and clear the buffer.
+
+        Returns:
+        - Number of records written.
+        """
+        count = len(self)
+        if count == 0:
+            return 0
+
+        os.makedirs(self.output_folder, exist_ok=True)
+        results_df = self.to_dataframe()
+        try:
+            if self.file_format == "csv":
+                write_header = not os.path.exists(self.output_path) or os.path.getsize(self.output_path) == 0
+                results_df.to_csv(self.output_path, mode="a", header=write_header, index=False)
+                written_to = self.output_path
+            else:
+                # Parquet files cannot be appended in place, so each flush adds a part file
+                os.makedirs(self.output_path, exist_ok=True)
+                results_df["Result"] = results_df["Result"].astype(str)
+                written_to = os.path.join(self.output_path, f"part-{self.session_id}-{self.flush_count:05d}.parquet")
+                results_df.to_parquet(written_to, index=False)
+        except ImportError as e:
+            raise ImportError(f"Writing Parquet results requires pyarrow: {e}") from e
+
+        self.flush_count += 1
+        self.buffer = {column: [] for column in self.COLUMNS}
+        print(f"Flushed {count} results to {written_to}")
+        return count
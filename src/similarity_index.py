@@ -0,0 +1,201 @@
+#%% MODULE BEGINS
+# module_name = "similarity_index.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Third-Party Library Imports
+import numpy as np
+import pandas as pd
+
+
+class DelayProfileIndex:
+    """
+    Cosine-similarity index over grouped delay-cause profiles (per airport, carrier, ...).
+
+    Features:
+    - Profiles are normalized once; similarity is then a matrix product.
+    - Exact top-k search with blocked matrix multiplication and argpartition.
+    - For large sets, a partitioned (inverted-file) index: items are clustered with
+      spherical k-means and queries only score the closest partitions.
+    - Single, label-based and batch k-nearest-neighbor queries.
+    """
+
+    def __init__(self, labels, profiles, partition_threshold=5000, n_partitions=None,
+                 n_probe=4, block_size=1024, seed=0):
+        """
+        Build the index.
+
+        Args:
+        - labels: Group labels, one per profile row
+        - profiles: (N, k) array of profile vectors
+        - partition_threshold: Build a partitioned index when N exceeds this size
+        - n_partitions: Number of partitions (defaults to about sqrt(N))
+        - n_probe: Number of partitions scored per query in partitioned mode
+        - block_size: Number of queries scored per matrix product in exact mode
+        - seed: Seed for the partition clustering
+        """
+        self.labels = pd.Index(labels)
+        if not self.labels.is_unique:
+            raise ValueError("Index labels must be unique.")
+        profiles = np.asarray(profiles, dtype=float)
+        self.units, self.valid = self._normalize(profiles)
+        self.block_size = block_size
+        self.n_probe = n_probe
+
+        self.centroids = None
+        self.partitions = None
+        if len(self.labels) > partition_threshold:
+            n_partitions = n_partitions or int(np.sqrt(len(self.labels)))
+            self._build_partitions(n_partitions, seed)
+
+    @classmethod
+    def from_data(cls, data, group_column, profile_columns, **kwargs):
+        """
+        Build an index from per-group sums of the profile columns.
+
+        Args:
+        - data: Source DataFrame
+        - group_column: Column that defines the groups (e.g. 'airport', 'carrier_name')
+        - profile_columns: Columns forming each profile (e.g. the delay-cause minutes)
+        - **kwargs: Passed to the constructor
+
+        Returns:
+        - DelayProfileIndex
+        """
+        profiles = data.groupby(group_column, observed=True)[profile_columns].sum()
+        return cls(profiles.index, profiles.to_numpy(), **kwargs)
+
+    @staticmethod
+    def _normalize(matrix):
+        """Return row-normalized vectors and a mask of rows with non-zero norm."""
+        norms = np.linalg.norm(matrix, axis=1)
+        valid = ~np.isclose(norms, 0)
+        units = np.zeros_like(matrix)
+        np.divide(matrix, norms[:, None], out=units, where=valid[:, None])
+        return units, valid
+
+    def _build_partitions(self, n_partitions, seed, iterations=10):
+        """Cluster the unit profiles with spherical k-means and store member lists."""
+        rng = np.random.default_rng(seed)
+        candidates = np.flatnonzero(self.valid)
+        n_partitions = max(1, min(n_partitions, len(candidates)))
+        centroids = self.units[rng.choice(candidates, n_partitions, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(self.units[candidates] @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, self.units[candidates])
+            updated, nonempty = self._normalize(sums)
+            # Keep the previous centroid for partitions that lost all members
+            centroids = np.where(nonempty[:, None], updated, centroids)
+        assignment = np.argmax(self.units[candidates] @ centroids.T, axis=1)
+        self.centroids = centroids
+        self.partitions = [candidates[assignment == p] for p in range(n_partitions)]
+
+    # --------------------
+    # Queries
+    # --------------------
+
+    def _top_k(self, scores, k):
+        """Return (indices, scores) of the k best columns of each row, best first."""
+        k = min(k, scores.shape[1])
+        if k == 0:
+            return np.empty((scores.shape[0], 0), dtype=np.int64), np.empty((scores.shape[0], 0))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def query_vectors(self, vectors, k=5, exclude=None):
+        """
+        Find the k most similar profiles for each query vector.
+
+        Args:
+        - vectors: (Q, k) array of query profiles (need not be normalized)
+        - k: Number of neighbors per query
+        - exclude: Optional (Q,) array of item positions to leave out (e.g. the query itself)
+
+        Returns:
+        - tuple: (neighbor positions (Q, k), cosine similarities (Q, k)); padded with -1 / NaN
+          when fewer than k candidates exist
+        """
+        queries, query_valid = self._normalize(np.atleast_2d(np.asarray(vectors, dtype=float)))
+        n_queries = len(queries)
+        k = min(k, len(self.labels))
+        positions = np.full((n_queries, k), -1, dtype=np.int64)
+        similarities = np.full((n_queries, k), np.nan)
+
+        if self.partitions is None:
+            for start in range(0, n_queries, self.block_size):
+                stop = min(start + self.block_size, n_queries)
+                scores = queries[start:stop] @ self.units.T
+                scores[:, ~self.valid] = -np.inf
+                if exclude is not None:
+                    scores[np.arange(stop - start), exclude[start:stop]] = -np.inf
+                positions[start:stop], similarities[start:stop] = self._top_k(scores, k)
+        else:
+            probe = min(self.n_probe, len(self.partitions))
+            nearest_partitions, _ = self._top_k(queries @ self.centroids.T, probe)
+            for q in range(n_queries):
+                candidates = np.concatenate([self.partitions[p] for p in nearest_partitions[q]])
+                if exclude is not None:
+                    candidates = candidates[candidates != exclude[q]]
+                scores = (self.units[candidates] @ queries[q])[None, :]
+                top, top_scores = self._top_k(scores, k)
+                found = top.shape[1]
+                positions[q, :found] = candidates[top[0]]
+                similarities[q, :found] = top_scores[0]
+
+        # Drop non-candidates (-inf scores) and queries that are zero vectors
+        missing = ~np.isfinite(similarities) | ~query_valid[:, None]
+        positions[missing] = -1
+        similarities[missing] = np.nan
+        return positions, np.clip(similarities, -1.0, 1.0)
+
+    def batch_query(self, labels, k=5, include_self=False):
+        """
+        Find the k most similar groups for each of several indexed groups.
+
+        Args:
+        - labels: Group labels present in the index (e.g. ['ORD', 'ATL'])
+        - k: Number of neighbors per query
+        - include_self: Whether a group may be returned as its own neighbor
+
+        Returns:
+        - DataFrame with query, rank, neighbor, cosine similarity and angle in degrees
+        """
+        query_positions = self.labels.get_indexer(labels)
+        if np.any(query_positions < 0):
+            missing = [label for label, pos in zip(labels, query_positions) if pos < 0]
+            raise KeyError(f"Group(s) not found in index: {', '.join(map(str, missing))}")
+
+        exclude = None if include_self else query_positions
+        positions, similarities = self.query_vectors(self.units[query_positions], k, exclude=exclude)
+        return self._to_frame(list(labels), positions, similarities)
+
+    def query(self, label, k=5, include_self=False):
+        """
+        Find the k groups whose profile is most similar to that of one group.
+
+        Args:
+        - label: Group label (e.g. 'ORD' or 'Southwest Airlines Inc.')
+        - k: Number of neighbors
+        - include_self: Whether the group may be returned as its own neighbor
+
+        Returns:
+        - DataFrame with rank, neighbor, cosine similarity and angle in degrees
+        """
+        return self.batch_query([label], k, include_self).drop(columns="Query")
+
+    def _to_frame(self, query_labels, positions, similarities):
+        """Convert neighbor arrays to a long-form DataFrame."""
+        n_queries, k = positions.shape
+        found = positions.ravel() >= 0
+        neighbor_labels = np.asarray(self.labels, dtype=object)[np.where(positions.ravel() >= 0, positions.ravel(), 0)]
+        similarity = similarities.ravel()
+        return pd.DataFrame({
+            "Query": np.repeat(np.asarray(query_labels, dtype=object), k),
+            "Rank": np.tile(np.arange(1, k + 1), n_queries),
+            "Neighbor": neighbor_labels,
+            "Cosine Similarity": similarity,
+            "Angle (degrees)": np.degrees(np.arccos(similarity)),
+        })[found].reset_index(drop=True)
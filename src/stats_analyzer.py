@@ -7,44 +7,165 @@
 import math
 import os
 import pickle
+import weakref
 from pathlib import Path
 
 # Third-Party Library Imports
 import pandas as pd
 import numpy as np
 
+# Relative Imports
+from .result_collector import ResultCollector
+from .numeric_store import NumericColumnStore
+from .parallel_executor import ParallelGroupExecutor
+from .derived_metrics import DerivedMetricRegistry
+from .data_loader import load_files
+from .quantile_sketch import QuantileSketchIndex, dataset_fingerprint
+from .data_validator import DatasetValidator
+
 
 class AdvanceCalculations:
+    # Columns each operation reads besides the ones passed to it; used for column projection
+    OPERATION_COLUMNS = {}
+    QUANTILE_INDEX_FILE = "quantile_sketch_index.pkl"
+
     def __init__(self, config):
         """
         Initialize the parent class with configurations and data storage.
         """
         self.config = config or {}
         self.data = None  # Placeholder for dataset
+        self.numeric_store = None  # Contiguous numeric columns, built at load
+        self.quantile_index = None  # Persisted quantile sketches, loaded on first use
+        self._data_fingerprint = None  # (weak reference to the frame, fingerprint of its source columns)
+        self.load_timings = None  # Per-file parse times of the last load
+        self.validation_report = None  # Consistency check of the last load
+        self.loaded_columns = None  # Projected columns of the last load; None when all were read
         self.output_folder = self.config.get('OUTPUT_FOLDER', 'Output')
         self.stats_cache = {}  # Cache for storing statistical results
+        # Session-wide collector for scalar results; shared when passed through config
+        self.result_collector = self.config.get('RESULT_COLLECTOR')
+        if self.result_collector is None:
+            self.result_collector = ResultCollector(self.output_folder)
+        # Named derived columns (delay_rate, ...); shared when passed through config
+        self.derived_metrics = self.config.get('DERIVED_METRICS')
+        if self.derived_metrics is None:
+            self.derived_metrics = DerivedMetricRegistry()
 
     # --------------------
     # Core Utilities
     # --------------------
 
-    def load_data(self):
-        """Load the dataset from the configured path."""
+    def load_data(self, columns=None, filters=None):
+        """
+        Load the dataset from the configured path (a file, a directory of CSV files or a glob pattern).
+
+        Args:
+        - columns: Optional columns to read, e.g. from columns_for(); derived metrics are
+          replaced by their source columns. All columns are read when None.
+        - filters: Optional row filters applied while the input is streamed, so only
+          matching rows are materialized, e.g. {"carrier": "DL", "month": (7, 9)}
+        """
+        self.loaded_columns = None if columns is None else self.derived_metrics.expand(columns)
         try:
-            self.data = pd.read_csv(self.config["DATA_PATH"])
+            self.data, self.load_timings = load_files(self.config["DATA_PATH"], columns=self.loaded_columns,
+                                                      filters=filters)
             print("Data loaded successfully!")
+            if len(self.load_timings) > 1:
+                print(self.load_timings.to_string(index=False))
+            validator = DatasetValidator()
+            self.validation_report = validator.validate(self.data)
+            print(validator.summarize(self.validation_report))
+            # Fingerprint the columns as loaded, before any derived columns are added
+            self.get_data_fingerprint()
         except FileNotFoundError:
             print(f"Error: File not found at {self.config['DATA_PATH']}")
             self.data = pd.DataFrame()
+        except KeyError as e:
+            # A filter names a column that is not in the input
+            print(f"Error loading data: {e}")
+            self.data = pd.DataFrame()
+        self.numeric_store = NumericColumnStore(self.data)
+
+    def columns_for(self, operations=(), columns=()):
+        """
+        Union of the columns needed by operations and by explicitly named columns.
+
+        Args:
+        - operations: Method names listed in OPERATION_COLUMNS (e.g. 'analyze_delay_cause_composition')
+        - columns: Columns passed to the operations (e.g. 'arr_delay', 'carrier', 'delay_rate')
+
+        Returns:
+        - List of source columns to pass to load_data(columns=...)
+        """
+        needed = []
+        for operation in operations:
+            if operation not in self.OPERATION_COLUMNS:
+                raise KeyError(f"Operation '{operation}' does not declare its columns.")
+            needed.extend(self.OPERATION_COLUMNS[operation])
+        return self.derived_metrics.expand(list(needed) + list(columns))
+
+    def get_numeric_store(self):
+        """
+        Return the numeric column store, rebuilding it if the dataset was replaced.
+        """
+        if self.data is None:
+            raise ValueError("Dataset is not loaded.")
+        if self.numeric_store is None or self.numeric_store.source_id != id(self.data) \
+                or self.numeric_store.n_rows != len(self.data):
+            self.numeric_store = NumericColumnStore(self.data)
+        return self.numeric_store
 
     def validate_column(self, column):
         """
-        Ensure the specified column exists in the dataset.
+        Ensure the specified column exists in the dataset, adding registered
+        derived metrics (e.g. 'delay_rate') as columns on first use.
         """
         if self.data is None or self.data.empty:
             raise ValueError("Dataset is not loaded or is empty.")
-        if column not in self.data.columns:
+        if column in self.data.columns:
+            return
+        if column not in self.derived_metrics:
+            if self.loaded_columns is not None:
+                raise ValueError(f"Column '{column}' was not loaded; include it in load_data(columns=...).")
             raise ValueError(f"Column '{column}' not found in dataset.")
+        try:
+            self.derived_metrics.materialize(self.data, [column])
+        except KeyError as e:
+            raise ValueError(f"Cannot compute derived column '{column}': {e}") from e
+        # The numeric store is rebuilt on next use to include the new column
+        self.numeric_store = None
+
+    def invalidate_column(self, column):
+        """
+        Mark a column of the dataset as changed after modifying it in place.
+
+        Drops the derived columns computed from it and every cache built from the data:
+        numeric store, the data fingerprint, quantile sketches and
+        saved statistics of the affected columns.
+
+        Returns:
+        - Set of the affected column names
+        """
+        affected = {column} | self.derived_metrics.invalidate(column, self.data)
+        for name in affected - {column}:
+            if self.data is not None and name in self.data.columns:
+                del self.data[name]
+        for name in affected:
+            for stat_type in self.stats_cache.pop(name, {}).keys() | {"mean", "median", "std"}:
+                filepath = os.path.join(self.output_folder, f"{name}_{stat_type}_stats.pkl")
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+        self.numeric_store = None
+        # The content changed, so the fingerprint does too; sketches of unaffected
+        # columns are kept and re-saved under the new fingerprint
+        self._data_fingerprint = None
+        if self.quantile_index is not None and self.data is not None:
+            self.quantile_index.sketches = {key: sketches for key, sketches in self.quantile_index.sketches.items()
+                                            if not affected & set(key)}
+            self.quantile_index.fingerprint = self.get_data_fingerprint()
+            self.quantile_index.save(os.path.join(self.output_folder, self.QUANTILE_INDEX_FILE))
+        return affected
 
     def save_stats_to_pickle(self, column, stat_type, value):
         """
@@ -113,7 +234,7 @@ class AdvanceCalculations:
         Calculate and save mean of a specified column.
         """
         self.validate_column(column)
-        mean_value = self.data[column].mean()
+        mean_value = self.reduce_column(column, 'mean')
         print(f"Mean of column '{column}' : {mean_value}")
         
         # Save to pickle
@@ -121,11 +242,16 @@ class AdvanceCalculations:
         
         return mean_value
 
-    def calculate_median(self, column):
+    def calculate_median(self, column, approximate=False):
         """
         Calculate and save median of a specified column.
+
+        With approximate=True the median comes from the quantile sketch index
+        (see calculate_percentiles) instead of a full sort.
         """
         self.validate_column(column)
+        if approximate:
+            return float(self.get_quantile_index(column).quantiles(column, [0.5])[0.5].iloc[0])
         median_value = self.data[column].median()
         print(f"Median of column '{column}' : {median_value}")
         
@@ -139,7 +265,7 @@ class AdvanceCalculations:
         Calculate and save standard deviation of a specified column.
         """
         self.validate_column(column)
-        std_value = self.data[column].std()
+        std_value = self.reduce_column(column, 'std')
         print(f"Standard Deviation of column '{column}' : {std_value}")
         
         # Save to pickle
@@ -147,6 +273,113 @@ class AdvanceCalculations:
         
         return std_value
 
+    def get_data_fingerprint(self):
+        """
+        Content fingerprint of the dataset's source columns, computed once per load.
+
+        Only the columns as loaded are hashed (attrs["source_columns"] set by the
+        loader), so derived metrics or 'region' added later do not change it.
+        """
+        if self.data is None:
+            raise ValueError("Dataset is not loaded.")
+        if self._data_fingerprint is None or self._data_fingerprint[0]() is not self.data:
+            columns = self.data.attrs.get("source_columns") or [
+                column for column in self.data.columns if column not in self.derived_metrics]
+            columns = [column for column in columns if column in self.data.columns]
+            self._data_fingerprint = (weakref.ref(self.data), dataset_fingerprint(self.data[columns]))
+        return self._data_fingerprint[1]
+
+    def get_quantile_index(self, column, group_column=None):
+        """
+        Return the quantile sketch index, sketching column (per group_column) if missing.
+
+        The index is persisted in the output folder with the dataset fingerprint and
+        reused across sessions as long as the data is unchanged.
+        """
+        self.validate_column(column)
+        if group_column is not None:
+            self.validate_column(group_column)
+        filepath = os.path.join(self.output_folder, self.QUANTILE_INDEX_FILE)
+        fingerprint = self.get_data_fingerprint()
+        if self.quantile_index is None or self.quantile_index.fingerprint != fingerprint:
+            self.quantile_index = QuantileSketchIndex.load(filepath, fingerprint) or QuantileSketchIndex(fingerprint)
+        if (column, group_column) not in self.quantile_index:
+            self.quantile_index.build(self.data, column, group_column)
+            self.quantile_index.save(filepath)
+        return self.quantile_index
+
+    def calculate_percentiles(self, column, percentiles=(50, 90, 99), group_column=None, exact=False):
+        """
+        Calculate percentiles of a column overall or per group.
+
+        Answers come from persisted KLL sketches; 'Rank Error' is the bound on the
+        rank error as a fraction of the group size (99% confidence; 0 when the group
+        is small enough to be stored exactly).
+
+        Args:
+        - column: Column name (e.g., 'arr_delay')
+        - percentiles: Percentiles in [0, 100]
+        - group_column: Optional column to group by (e.g., 'carrier')
+        - exact: Compute exact percentiles from the data instead
+
+        Returns:
+        - DataFrame with one 'p<percentile>' column per percentile and a 'Rank Error' column
+        """
+        quantiles = [p / 100 for p in percentiles]
+        if exact:
+            self.validate_column(column)
+            if group_column is None:
+                result = pd.DataFrame([self.data[column].quantile(quantiles).to_numpy()],
+                                      index=pd.Index(["All"]), columns=quantiles)
+            else:
+                self.validate_column(group_column)
+                result = self.data.groupby(group_column, observed=True)[column].quantile(quantiles).unstack()
+            result["Rank Error"] = 0.0
+        else:
+            result = self.get_quantile_index(column, group_column).quantiles(column, quantiles, group_column)
+        result.columns = [f"p{p:g}" for p in percentiles] + ["Rank Error"]
+        print(f"Percentiles of column '{column}':\n{result}")
+        return result
+
+    def get_parallel_executor(self, max_workers=None):
+        """
+        Return a multi-core executor over the loaded dataset's numeric store.
+
+        Use it as a context manager so its shared memory is released:
+
+            with calc.get_parallel_executor() as executor:
+                executor.grouped_statistics('carrier', ['arr_delay'])
+        
+        Args:
+        - max_workers: Number of worker processes (defaults to the CPU count)
+        
+        Returns:
+        - ParallelGroupExecutor
+        """
+        if self.data is None or self.data.empty:
+            raise ValueError("Dataset is not loaded or is empty.")
+        return ParallelGroupExecutor(self.data, self.get_numeric_store(), max_workers=max_workers)
+
+    def reduce_column(self, column, stat_type):
+        """
+        Compute the mean or standard deviation of a column, skipping missing values.
+
+        Numeric columns are reduced from the numeric column store (no filled copies);
+        other columns fall back to pandas.
+        
+        Args:
+        - column: Column name
+        - stat_type: 'mean' or 'std'
+        
+        Returns:
+        - Calculated statistical value
+        """
+        self.validate_column(column)
+        store = self.get_numeric_store()
+        if column in store:
+            return store.mean(column) if stat_type == 'mean' else store.std(column)
+        return self.data[column].mean() if stat_type == 'mean' else self.data[column].std()
+
     # --------------------
     # Probability Utilities
     # --------------------
@@ -157,7 +390,7 @@ class AdvanceCalculations:
         """
         self.validate_column(col1)
         self.validate_column(col2)
-        prob_value = self.data.groupby([col1, col2]).size().unstack(fill_value=0)
+        prob_value = self.data.groupby([col1, col2], observed=True).size().unstack(fill_value=0)
         print(f"Probability is  {prob_value}")
         return prob_value
     
@@ -189,7 +422,9 @@ class AdvanceCalculations:
         - Series with value frequencies
         """
         self.validate_column(column)
-        return self.data[column].value_counts()
+        counts = self.data[column].value_counts()
+        # Categorical columns also list unused categories with a count of 0
+        return counts[counts > 0]
 
     def factorial(self, n):
         """
@@ -0,0 +1,203 @@
+#%% MODULE BEGINS
+# module_name = "time_windows.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Standard Library Imports
+import weakref
+
+# Third-Party Library Imports
+import pandas as pd
+import numpy as np
+
+# Relative Imports
+from .probability_calc import ProbabilityCalculations
+from .config import AIRPORT_TO_REGION
+
+
+class TimeWindowCalculations(ProbabilityCalculations):
+    """
+    Extends ProbabilityCalculations with rolling and seasonal aggregates over year/month.
+
+    Features:
+    - Builds, once per (group, value, weight) combination, a dense group x month
+      layout with cumulative-sum arrays along time.
+    - Any window sum, and so any trailing mean, is then two lookups per group (O(1)).
+    - Trailing-N-month mean delay, month-over-month change and same-month-last-year
+      comparison per carrier, airport or region.
+    """
+    # 'airport' is needed to derive regions
+    OPERATION_COLUMNS = {
+        "calculate_time_window_aggregates": ["year", "month", "arr_delay", "arr_flights", "airport"],
+        "window_mean": ["year", "month", "arr_delay", "arr_flights", "airport"],
+    }
+
+    def __init__(self, config):
+        """
+        Initialize the time window calculator with configurations.
+
+        Args:
+        - config: Dictionary containing configuration (e.g., data path).
+        """
+        super().__init__(config)
+        self.time_indexes = {}  # Cache of prefix-sum layouts
+        self._time_index_source = None  # (weak reference to the frame, its data version) the layouts are of
+
+    def _ensure_region(self):
+        """Add the 'region' column from the airport-to-region mapping if it is missing."""
+        if 'region' in self.data.columns:
+            return
+        self.validate_column('airport')
+        self.data['region'] = self.data['airport'].map(AIRPORT_TO_REGION).fillna('Other')
+        self.invalidate_column('region')
+
+    def invalidate_column(self, column):
+        """Mark a column as changed, also dropping the time indexes built from it."""
+        affected = super().invalidate_column(column)
+        if column in ('year', 'month', 'airport'):
+            # Every index is laid out over (year, month); regions come from airports
+            self.time_indexes = {}
+        else:
+            self.time_indexes = {key: index for key, index in self.time_indexes.items()
+                                 if not affected & set(key)}
+        return affected
+
+    def build_time_index(self, group_column, value_column='arr_delay', weight_column='arr_flights'):
+        """
+        Build (or return the cached) prefix-sum layout for a group column.
+
+        Args:
+        - group_column: Column to group by ('carrier', 'airport', 'region', ...)
+        - value_column: Column to aggregate (e.g., 'arr_delay' minutes)
+        - weight_column: Denominator column (e.g., 'arr_flights'); None counts rows
+
+        Returns:
+        - dict with 'groups', 'start' (year, month), 'n_periods', and cumulative
+          arrays 'value_cumsum', 'weight_cumsum', 'rows_cumsum' of shape (groups, periods + 1)
+        """
+        if self.data is None:
+            raise ValueError("Dataset is not loaded.")
+        # Layouts belong to one frame and data version; a replaced or reloaded frame drops them
+        version = self.derived_metrics.version(self.data)
+        source = self._time_index_source
+        if source is None or source[0]() is not self.data or source[1] != version:
+            self.time_indexes = {}
+            self._time_index_source = (weakref.ref(self.data), version)
+        key = (group_column, value_column, weight_column)
+        if key in self.time_indexes:
+            return self.time_indexes[key]
+
+        if group_column == 'region':
+            self._ensure_region()
+        for column in ('year', 'month', group_column, value_column) + ((weight_column,) if weight_column else ()):
+            self.validate_column(column)
+
+        periods = self.data['year'].to_numpy(dtype=np.int64) * 12 + self.data['month'].to_numpy(dtype=np.int64) - 1
+        first_period = int(periods.min())
+        n_periods = int(periods.max()) - first_period + 1
+        codes, groups = pd.factorize(self.data[group_column], sort=True)
+
+        # Rows with a missing group or value do not contribute
+        values = self.data[value_column].to_numpy(dtype=float)
+        keep = (codes >= 0) & ~np.isnan(values)
+        if weight_column:
+            weights = self.data[weight_column].to_numpy(dtype=float)
+            keep &= ~np.isnan(weights)
+        else:
+            weights = np.ones(len(values))
+        cells = codes[keep] * n_periods + (periods[keep] - first_period)
+        size = len(groups) * n_periods
+
+        def cumulative(weights_per_row):
+            grid = np.bincount(cells, weights=weights_per_row, minlength=size).reshape(len(groups), n_periods)
+            return np.concatenate([np.zeros((len(groups), 1)), np.cumsum(grid, axis=1)], axis=1)
+
+        index = {
+            "groups": pd.Index(groups, name=group_column),
+            "start": divmod(first_period, 12),
+            "n_periods": n_periods,
+            "value_cumsum": cumulative(values[keep]),
+            "weight_cumsum": cumulative(weights[keep]),
+            "rows_cumsum": cumulative(None),
+        }
+        self.time_indexes[key] = index
+        return index
+
+    @staticmethod
+    def _window_sums(cumsum, window):
+        """Sums over the trailing `window` periods ending at every period (vectorized)."""
+        n_periods = cumsum.shape[1] - 1
+        ends = np.arange(1, n_periods + 1)
+        starts = np.maximum(ends - window, 0)
+        return cumsum[:, ends] - cumsum[:, starts]
+
+    def window_mean(self, group_column, group, year, month, window=3,
+                    value_column='arr_delay', weight_column='arr_flights'):
+        """
+        Mean of value per unit weight over the `window` months ending at (year, month), in O(1).
+
+        Returns:
+        - Float mean (e.g. delay minutes per flight), NaN if the window has no data
+        """
+        index = self.build_time_index(group_column, value_column, weight_column)
+        g = index["groups"].get_loc(group)
+        end = (year * 12 + month - 1) - (index["start"][0] * 12 + index["start"][1]) + 1
+        if not 1 <= end <= index["n_periods"]:
+            raise ValueError(f"{year}-{month:02d} is outside the data's time range.")
+        start = max(end - window, 0)
+        weight = index["weight_cumsum"][g, end] - index["weight_cumsum"][g, start]
+        value = index["value_cumsum"][g, end] - index["value_cumsum"][g, start]
+        return value / weight if weight else np.nan
+
+    def calculate_time_window_aggregates(self, group_column, window=3,
+                                         value_column='arr_delay', weight_column='arr_flights'):
+        """
+        Calculate rolling and seasonal aggregates for every group and month.
+
+        Columns:
+        - mean_delay: value / weight in the month (e.g. delay minutes per flight)
+        - trailing_{window}_month_mean: value / weight over the trailing window
+        - mom_change: change of mean_delay from the previous month
+        - same_month_last_year / yoy_change: mean_delay twelve months earlier and the change
+
+        Args:
+        - group_column: Column to group by ('carrier', 'airport', 'region', ...)
+        - window: Number of months in the trailing window
+        - value_column: Column to aggregate
+        - weight_column: Denominator column; None averages per row
+
+        Returns:
+        - DataFrame with one row per (group, month) that has data
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        index = self.build_time_index(group_column, value_column, weight_column)
+        n_groups, n_periods = len(index["groups"]), index["n_periods"]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            monthly = self._window_sums(index["value_cumsum"], 1) / self._window_sums(index["weight_cumsum"], 1)
+            trailing = (self._window_sums(index["value_cumsum"], window)
+                        / self._window_sums(index["weight_cumsum"], window))
+        rows = self._window_sums(index["rows_cumsum"], 1)
+
+        previous = np.full_like(monthly, np.nan)
+        previous[:, 1:] = monthly[:, :-1]
+        last_year = np.full_like(monthly, np.nan)
+        last_year[:, 12:] = monthly[:, :-12]
+
+        periods = index["start"][0] * 12 + index["start"][1] + np.arange(n_periods)
+        result = pd.DataFrame({
+            group_column: np.repeat(index["groups"].to_numpy(), n_periods),
+            "year": np.tile(periods // 12, n_groups),
+            "month": np.tile(periods % 12 + 1, n_groups),
+            "rows": rows.ravel().astype(np.int64),
+            "mean_delay": monthly.ravel(),
+            f"trailing_{window}_month_mean": trailing.ravel(),
+            "mom_change": (monthly - previous).ravel(),
+            "same_month_last_year": last_year.ravel(),
+            "yoy_change": (monthly - last_year).ravel(),
+        })
+        result = result[result["rows"] > 0].reset_index(drop=True)
+
+        self.save_to_output(f"{group_column}_time_window_aggregates.csv", result)
+        return result
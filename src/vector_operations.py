@@ -4,6 +4,7 @@
 #%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 # Standard Library Imports
+import math
 import os
 
 # Third-Party Library Imports
@@ -12,8 +13,30 @@ import pandas as pd  # type: ignore
 
 # Relative Imports
 from .stats_analyzer import AdvanceCalculations
+from .similarity_index import DelayProfileIndex
+from .data_loader import iter_chunks
 
 
+class _CompensatedSum:
+    """Running Neumaier (improved Kahan) sum of floats with O(1) memory."""
+
+    def __init__(self):
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def add(self, value):
+        value = float(value)
+        new_total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - new_total) + value
+        else:
+            self.compensation += (value - new_total) + self.total
+        self.total = new_total
+
+    @property
+    def value(self):
+        return self.total + self.compensation
+
 
 class VectorOperations(AdvanceCalculations):
     """
@@ -27,7 +50,8 @@ class VectorOperations(AdvanceCalculations):
         super().__init__(config)
         self.output_folder = "Output"
         self.data = None
-        self.load_data()
+        # Optional column projection, e.g. {"COLUMNS": ["arr_delay", "arr_flights"]}
+        self.load_data(self.config.get("COLUMNS"))
 
     # def load_data(self):
     #     """Load data from the configured path."""
@@ -45,49 +69,71 @@ class VectorOperations(AdvanceCalculations):
             vector2 = vector2[:min_length]
         return vector1, vector2
 
-    def perform_vector_operations(self, column1, column2):
+    # Full-length results, written to .npy files named by the slug
+    VECTOR_OPERATIONS = {
+        "Addition": ("addition", np.add),
+        "Subtraction": ("subtraction", np.subtract),
+        "Element-wise Multiplication": ("elementwise_multiplication", np.multiply),
+    }
+    # Scalar results, written to the small CSV table
+    SCALAR_OPERATIONS = (
+        "Dot Product",
+        "Vector 1 Magnitude",
+        "Vector 2 Magnitude",
+        "Angle (radians)",
+        "Angle (degrees)",
+        "Orthogonal",
+    )
+
+    def perform_vector_operations(self, column1, column2, operations=None):
         """
-        Perform various vector operations on two columns.
+        Perform the requested vector operations on two columns.
+
+        Operations are computed lazily: only the requested ones run, and shared
+        intermediates (dot product, magnitudes) are computed once. Full-length
+        results are written straight into .npy files (memory-mapped, no extra
+        in-memory temporaries) and scalar results to a small CSV table.
         
         Args:
             column1 (str): Name of first column
             column2 (str): Name of second column
+            operations (list): Names from VECTOR_OPERATIONS / SCALAR_OPERATIONS; all when None
             
         Returns:
-            tuple: (results_dict, vector1, vector2)
+            tuple: (results_dict, vector1, vector2) with the first 5 elements of vectors for display
         """
         try:
             # Validate columns exist in dataset
             if column1 not in self.data.columns or column2 not in self.data.columns:
                 raise ValueError(f"Column not found: {column1 if column1 not in self.data.columns else column2}")
 
-            # Get vectors and handle NaN values
-            vector1 = self.data[column1].fillna(0).to_numpy()
-            vector2 = self.data[column2].fillna(0).to_numpy()
+            if operations is None:
+                operations = list(self.VECTOR_OPERATIONS) + list(self.SCALAR_OPERATIONS)
+            unknown = [op for op in operations if op not in self.VECTOR_OPERATIONS and op not in self.SCALAR_OPERATIONS]
+            if unknown:
+                raise ValueError(f"Unsupported operation(s): {', '.join(unknown)}")
+
+            # Zero-filled column views from the shared numeric store (no copies)
+            store = self.get_numeric_store()
+            vector1 = store.column(column1, "zero")
+            vector2 = store.column(column2, "zero")
 
             # Validate and adjust vectors
             vector1, vector2 = self.validate_vectors(vector1, vector2)
 
-            # Perform calculations
-            results = {
-                "Addition": vector1 + vector2,
-                "Subtraction": vector1 - vector2,
-                "Dot Product": float(np.dot(vector1, vector2)),
-                "Element-wise Multiplication": vector1 * vector2,
-                "Vector 1 Magnitude": float(np.linalg.norm(vector1)),
-                "Vector 2 Magnitude": float(np.linalg.norm(vector2))
-            }
-
-            # Calculate angle between vectors
-            angle = self.calculate_angle_between_vectors(vector1, vector2)
-            results["Angle (radians)"] = float(angle)
-            results["Angle (degrees)"] = float(np.degrees(angle))
+            scalars = self._lazy_scalar_operations(vector1, vector2)
+            results = {}
+            files = {}
+            for operation in operations:
+                if operation in self.VECTOR_OPERATIONS:
+                    slug, ufunc = self.VECTOR_OPERATIONS[operation]
+                    files[operation], results[operation] = self._save_vector_result(
+                        column1, column2, slug, ufunc, vector1, vector2)
+                else:
+                    results[operation] = scalars(operation)
 
-            # Check orthogonality
-            results["Orthogonal"] = self.check_for_orthogonality(vector1, vector2)
-
-            # Save results
-            self._save_results_to_csv(column1, column2, results)
+            # Save scalar table (vector results reference their .npy files)
+            self._save_results_to_csv(column1, column2, results, files)
 
             # Return first 5 elements for display
             display_results = {k: v[:5].tolist() if isinstance(v, np.ndarray) else v 
@@ -98,6 +144,205 @@ class VectorOperations(AdvanceCalculations):
         except Exception as e:
             raise RuntimeError(f"Error during vector operations: {e}")
 
+    def _lazy_scalar_operations(self, vector1, vector2):
+        """
+        Return a function computing scalar operations on demand.
+
+        Intermediate values are memoized so the dot product and magnitudes are
+        computed at most once per call of perform_vector_operations.
+        """
+        memo = {}
+
+        def get(name):
+            if name in memo:
+                return memo[name]
+            if name == "Dot Product":
+                value = float(np.dot(vector1, vector2))
+            elif name == "Vector 1 Magnitude":
+                value = float(np.linalg.norm(vector1))
+            elif name == "Vector 2 Magnitude":
+                value = float(np.linalg.norm(vector2))
+            elif name == "Angle (radians)":
+                norms = get("Vector 1 Magnitude") * get("Vector 2 Magnitude")
+                if np.isclose(norms, 0):
+                    raise ValueError("Cannot calculate angle with zero vector.")
+                value = float(np.arccos(np.clip(get("Dot Product") / norms, -1.0, 1.0)))
+            elif name == "Angle (degrees)":
+                value = float(np.degrees(get("Angle (radians)")))
+            elif name == "Orthogonal":
+                value = bool(np.isclose(get("Dot Product"), 0))
+            else:
+                raise ValueError(f"Unsupported operation: {name}")
+            memo[name] = value
+            return value
+
+        return get
+
+    def _save_vector_result(self, column1, column2, slug, ufunc, vector1, vector2):
+        """
+        Compute an element-wise operation directly into a memory-mapped .npy file.
+
+        Returns:
+        - tuple: (output path, read-only memory map of the saved result)
+        """
+        os.makedirs(self.output_folder, exist_ok=True)
+        output_path = os.path.join(self.output_folder, f"{column1}_{column2}_{slug}.npy")
+        out = np.lib.format.open_memmap(output_path, mode="w+",
+                                        dtype=np.result_type(vector1, vector2), shape=vector1.shape)
+        ufunc(vector1, vector2, out=out)
+        out.flush()
+        del out
+        print(f"Vector result saved to {output_path}")
+        return output_path, np.load(output_path, mmap_mode="r")
+
+    def perform_pairwise_vector_operations(self, columns=None):
+        """
+        Compare every pair of numeric columns from a single matrix product.
+
+        The selected columns are stacked into one matrix X, and the Gram matrix
+        X^T X gives all dot products at once; magnitudes are its diagonal, from
+        which cosine similarity, angle and orthogonality follow element-wise.
+        
+        Args:
+            columns (list): Numeric columns to compare; all numeric columns when None
+            
+        Returns:
+            dict: Square DataFrames keyed by "Dot Product", "Cosine Similarity",
+                  "Angle (radians)", "Angle (degrees)" and "Orthogonal"
+        """
+        try:
+            if columns is None:
+                columns = list(self.data.select_dtypes(include=['number']).columns)
+            missing = [column for column in columns if column not in self.data.columns]
+            if missing:
+                raise ValueError(f"Column not found: {', '.join(missing)}")
+            if len(columns) < 2:
+                raise ValueError("At least two columns are required for pairwise operations.")
+
+            store = self.get_numeric_store()
+            matrix = store.matrix(None if columns == store.columns else columns)
+            gram = matrix.T @ matrix
+            magnitudes = np.sqrt(np.diag(gram))
+            norms = np.outer(magnitudes, magnitudes)
+
+            # Pairs involving a zero vector have no defined angle
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cosine = np.where(np.isclose(norms, 0), np.nan, gram / norms)
+            angle = np.arccos(np.clip(cosine, -1.0, 1.0))
+
+            results = {
+                "Dot Product": gram,
+                "Cosine Similarity": cosine,
+                "Angle (radians)": angle,
+                "Angle (degrees)": np.degrees(angle),
+                "Orthogonal": np.isclose(gram, 0),
+            }
+
+            # One row per unordered pair of distinct columns, all in a single file
+            rows, cols = np.triu_indices(len(columns), k=1)
+            column_names = np.asarray(columns, dtype=object)
+            pairs_df = pd.DataFrame({
+                "Column 1": column_names[rows],
+                "Column 2": column_names[cols],
+                "Vector 1 Magnitude": magnitudes[rows],
+                "Vector 2 Magnitude": magnitudes[cols],
+                **{name: values[rows, cols] for name, values in results.items()},
+            })
+            os.makedirs(self.output_folder, exist_ok=True)
+            output_path = os.path.join(self.output_folder, "pairwise_vector_operations.csv")
+            pairs_df.to_csv(output_path, index=False)
+            print(f"Results saved to {output_path}")
+
+            return {name: pd.DataFrame(values, index=columns, columns=columns)
+                    for name, values in results.items()}
+
+        except Exception as e:
+            raise RuntimeError(f"Error during pairwise vector operations: {e}")
+
+    def stream_vector_reductions(self, column1, column2, chunk_size=100_000, source=None, projection_path=None):
+        """
+        Dot product, magnitudes, angle and projection of two columns, computed chunk by chunk.
+
+        Only one chunk of each column is in memory at a time. Within a chunk NumPy's
+        pairwise summation is used; chunk partials are combined with compensated
+        (Neumaier) summation, so results match the in-memory path to tight tolerance.
+        
+        Args:
+            column1 (str): Name of first column
+            column2 (str): Name of second column
+            chunk_size (int): Number of rows per chunk
+            source (dict): Optional {column: path to .npy file}, read memory-mapped;
+                           by default the configured CSV is read in chunks
+            projection_path (str): Optional .npy path for the projection of column1 onto
+                                   column2, written chunk by chunk in a second pass
+            
+        Returns:
+            dict: Scalar results (dot product, magnitudes, angle, orthogonality,
+                  projection coefficient and row count)
+        """
+        try:
+            dot, squares1, squares2 = _CompensatedSum(), _CompensatedSum(), _CompensatedSum()
+            rows = 0
+            for vector1, vector2 in self._iter_column_chunks(column1, column2, chunk_size, source):
+                dot.add(np.sum(vector1 * vector2))
+                squares1.add(np.sum(vector1 * vector1))
+                squares2.add(np.sum(vector2 * vector2))
+                rows += len(vector1)
+
+            magnitude1 = math.sqrt(squares1.value)
+            magnitude2 = math.sqrt(squares2.value)
+            norms = magnitude1 * magnitude2
+            if np.isclose(norms, 0):
+                raise ValueError("Cannot calculate angle with zero vector.")
+            angle = float(np.arccos(np.clip(dot.value / norms, -1.0, 1.0)))
+            coefficient = dot.value / squares2.value
+
+            results = {
+                "Dot Product": dot.value,
+                "Vector 1 Magnitude": magnitude1,
+                "Vector 2 Magnitude": magnitude2,
+                "Angle (radians)": angle,
+                "Angle (degrees)": float(np.degrees(angle)),
+                "Orthogonal": bool(np.isclose(dot.value, 0)),
+                "Projection Coefficient": coefficient,
+                "Rows": rows,
+            }
+
+            if projection_path is not None:
+                projection = np.lib.format.open_memmap(projection_path, mode="w+", dtype=float, shape=(rows,))
+                start = 0
+                for _, vector2 in self._iter_column_chunks(column1, column2, chunk_size, source):
+                    np.multiply(vector2, coefficient, out=projection[start:start + len(vector2)])
+                    start += len(vector2)
+                projection.flush()
+                del projection
+                print(f"Projection vector saved to {projection_path}")
+
+            return results
+
+        except Exception as e:
+            raise RuntimeError(f"Error during streaming vector reductions: {e}")
+
+    def _iter_column_chunks(self, column1, column2, chunk_size, source=None):
+        """
+        Yield aligned float chunks of two columns with NaN replaced by 0.
+
+        Reads memory-mapped .npy files when source maps columns to paths,
+        otherwise streams the configured input files with only the two columns parsed.
+        """
+        if source is not None:
+            array1 = np.load(source[column1], mmap_mode="r")
+            array2 = np.load(source[column2], mmap_mode="r")
+            length = min(len(array1), len(array2))
+            for start in range(0, length, chunk_size):
+                stop = min(start + chunk_size, length)
+                yield (np.nan_to_num(np.asarray(array1[start:stop], dtype=float)),
+                       np.nan_to_num(np.asarray(array2[start:stop], dtype=float)))
+        else:
+            for chunk in iter_chunks(self.config["DATA_PATH"], columns=[column1, column2], chunk_size=chunk_size):
+                yield (chunk[column1].fillna(0).to_numpy(dtype=float),
+                       chunk[column2].fillna(0).to_numpy(dtype=float))
+
     def obtain_position_vector(self, origin, point):
         """Calculate position vector from origin to point."""
         try:
@@ -125,6 +370,178 @@ class VectorOperations(AdvanceCalculations):
         except Exception as e:
             raise ValueError(f"Error calculating projection vector: {e}")
 
+    # --------------------
+    # Batched (row-wise) operations
+    # --------------------
+
+    DELAY_CAUSE_COLUMNS = [
+        "carrier_delay",
+        "weather_delay",
+        "nas_delay",
+        "security_delay",
+        "late_aircraft_delay",
+    ]
+    OPERATION_COLUMNS = {
+        "analyze_delay_cause_composition": DELAY_CAUSE_COLUMNS,
+        "build_similarity_index": DELAY_CAUSE_COLUMNS + ["airport"],
+    }
+
+    def obtain_position_vectors_batch(self, origins, points):
+        """
+        Calculate position vectors for many (origin, point) pairs at once.
+
+        Args:
+            origins: (N, k) array, or a single (k,) origin broadcast to every point
+            points: (N, k) array of points
+
+        Returns:
+            np.ndarray: (N, k) array of position vectors
+        """
+        try:
+            return np.asarray(points, dtype=float) - np.asarray(origins, dtype=float)
+        except Exception as e:
+            raise ValueError(f"Error calculating position vectors: {e}")
+
+    def obtain_unit_vectors_batch(self, matrix):
+        """
+        Normalize every row of an (N, k) array.
+
+        Zero rows are not an error: they stay zero and are flagged in the mask.
+
+        Returns:
+            tuple: (unit vectors (N, k), boolean mask of rows with non-zero norm)
+        """
+        try:
+            matrix = np.asarray(matrix, dtype=float)
+            norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+            valid = ~np.isclose(norms, 0)
+            units = np.zeros_like(matrix)
+            np.divide(matrix, norms[:, None], out=units, where=valid[:, None])
+            return units, valid
+        except Exception as e:
+            raise ValueError(f"Error calculating unit vectors: {e}")
+
+    def obtain_projection_vectors_batch(self, matrix, onto_vectors, return_projections=True):
+        """
+        Project every row of an (N, k) array onto one or several reference vectors.
+
+        Args:
+            matrix: (N, k) array of row vectors
+            onto_vectors: a single (k,) vector or an (M, k) array of reference profiles
+            return_projections: If False, only the coefficients are computed and projections
+                                is None (skips the (N, M, k) projection array)
+
+        Returns:
+            tuple: (projections, coefficients, valid) where for a single reference
+                   projections is (N, k) and coefficients (N,), and for M references
+                   projections is (N, M, k) and coefficients (N, M). Zero reference
+                   vectors get coefficient 0 and are False in the valid mask.
+        """
+        try:
+            matrix = np.asarray(matrix, dtype=float)
+            onto = np.asarray(onto_vectors, dtype=float)
+            single = onto.ndim == 1
+            onto = np.atleast_2d(onto)
+
+            squared_norms = np.einsum("mk,mk->m", onto, onto)
+            valid = ~np.isclose(squared_norms, 0)
+            dots = np.einsum("nk,mk->nm", matrix, onto)
+            coefficients = np.zeros_like(dots)
+            np.divide(dots, squared_norms[None, :], out=coefficients, where=valid[None, :])
+            if not return_projections:
+                projections = None
+            elif single:
+                projections = coefficients[:, :1] * onto[0]
+            else:
+                projections = np.einsum("nm,mk->nmk", coefficients, onto)
+
+            if single:
+                return projections, coefficients[:, 0], bool(valid[0])
+            return projections, coefficients, valid
+        except Exception as e:
+            raise ValueError(f"Error calculating projection vectors: {e}")
+
+    def calculate_cosine_similarity_batch(self, matrix, reference_vectors):
+        """
+        Cosine similarity of every row with every reference vector.
+
+        Returns:
+            np.ndarray: (N, M) similarities; NaN where either vector is zero
+        """
+        row_units, row_valid = self.obtain_unit_vectors_batch(matrix)
+        reference_units, reference_valid = self.obtain_unit_vectors_batch(np.atleast_2d(reference_vectors))
+        similarity = np.clip(row_units @ reference_units.T, -1.0, 1.0)
+        similarity[~row_valid, :] = np.nan
+        similarity[:, ~reference_valid] = np.nan
+        return similarity
+
+    def analyze_delay_cause_composition(self, reference_profiles=None):
+        """
+        Treat each row's delay-cause minutes as a 5-D vector and compare it with reference profiles.
+        
+        Args:
+            reference_profiles (dict): {name: 5-element profile} in DELAY_CAUSE_COLUMNS order;
+                                       defaults to the dataset-wide cause totals ("Overall")
+
+        Returns:
+            pd.DataFrame: Per row, the share of each cause, the dominant cause, and the
+                          cosine similarity, angle and projection coefficient for each profile
+        """
+        try:
+            store = self.get_numeric_store()
+            matrix = store.matrix(self.DELAY_CAUSE_COLUMNS)
+            if reference_profiles is None:
+                reference_profiles = {"Overall": matrix.sum(axis=0)}
+            names = list(reference_profiles)
+            references = np.array([reference_profiles[name] for name in names], dtype=float)
+
+            totals = matrix.sum(axis=1)
+            has_delay = ~np.isclose(totals, 0)
+            shares = np.full_like(matrix, np.nan)
+            np.divide(matrix, totals[:, None], out=shares, where=has_delay[:, None])
+
+            similarity = self.calculate_cosine_similarity_batch(matrix, references)
+            _, coefficients, _ = self.obtain_projection_vectors_batch(matrix, references,
+                                                                   return_projections=False)
+
+            result = pd.DataFrame(shares, columns=[f"{column}_share" for column in self.DELAY_CAUSE_COLUMNS],
+                                  index=self.data.index)
+            dominant = np.asarray(self.DELAY_CAUSE_COLUMNS, dtype=object)[np.argmax(matrix, axis=1)]
+            result["dominant_cause"] = np.where(has_delay, dominant, None)
+            for i, name in enumerate(names):
+                result[f"cosine_{name}"] = similarity[:, i]
+                result[f"angle_degrees_{name}"] = np.degrees(np.arccos(similarity[:, i]))
+                result[f"projection_{name}"] = coefficients[:, i]
+
+            os.makedirs(self.output_folder, exist_ok=True)
+            output_path = os.path.join(self.output_folder, "delay_cause_composition.csv")
+            result.to_csv(output_path, index=False)
+            print(f"Results saved to {output_path}")
+            return result
+
+        except Exception as e:
+            raise RuntimeError(f"Error analyzing delay cause composition: {e}")
+
+    def build_similarity_index(self, group_column="airport", profile_columns=None, **kwargs):
+        """
+        Build a similarity index over per-group delay-cause profiles.
+
+        Answers questions such as "which airports have a delay-cause profile most
+        like ORD's?" with index.query("ORD").
+        
+        Args:
+            group_column (str): Column that defines the groups (e.g. 'airport', 'carrier_name')
+            profile_columns (list): Profile columns; defaults to DELAY_CAUSE_COLUMNS
+            **kwargs: Passed to DelayProfileIndex (k-NN index options)
+
+        Returns:
+            DelayProfileIndex
+        """
+        profile_columns = profile_columns or self.DELAY_CAUSE_COLUMNS
+        for column in [group_column] + list(profile_columns):
+            self.validate_column(column)
+        return DelayProfileIndex.from_data(self.data, group_column, profile_columns, **kwargs)
+
     def calculate_angle_between_vectors(self, vector1, vector2):
         """Calculate angle between vectors in radians."""
         try:
@@ -147,8 +564,9 @@ class VectorOperations(AdvanceCalculations):
         except Exception as e:
             raise ValueError(f"Error checking orthogonality: {e}")
 
-    def _save_results_to_csv(self, column1, column2, results):
-        """Save results to CSV file."""
+    def _save_results_to_csv(self, column1, column2, results, files=None):
+        """Save scalar results to CSV file; vector results are listed with their .npy file."""
+        files = files or {}
         try:
             if not os.path.exists(self.output_folder):
                 os.makedirs(self.output_folder)
@@ -156,7 +574,8 @@ class VectorOperations(AdvanceCalculations):
             # Prepare results for saving
             df_results = pd.DataFrame({
                 "Operation": list(results.keys()),
-                "Result": [str(results[key]) for key in results]
+                "Result": [None if key in files else results[key] for key in results],
+                "File": [files.get(key) for key in results]
             })
 
             # Save to file
@@ -166,4 +585,4 @@ class VectorOperations(AdvanceCalculations):
             print(f"Results saved to {output_path}")
             
         except Exception as e:
-            print(f"Warning: Could not save results to file: {e}")
\ No newline at end of file
+            print(f"Warning: Could not save results to file: {e}")
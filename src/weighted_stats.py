@@ -0,0 +1,156 @@
+#%% MODULE BEGINS
+# module_name = "weighted_stats.py"
+
+#%% IMPORTS   ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Third-Party Library Imports
+import pandas as pd
+import numpy as np
+
+# Relative Imports
+from .probability_calc import ProbabilityCalculations
+
+
+class WeightedStatistics(ProbabilityCalculations):
+    """
+    Extends ProbabilityCalculations with weighted quantiles and weighted dispersion.
+
+    Features:
+    - Weighted mean, median, arbitrary quantiles, variance and standard deviation.
+    - Overall results or one row per group (e.g. carrier or airport).
+    - Sorts once per call and answers every quantile from cumulative weight arrays.
+    """
+    DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+    def __init__(self, config):
+        """
+        Initialize the weighted statistics calculator with configurations.
+
+        Args:
+        - config: Dictionary containing configuration (e.g., data path).
+        """
+        super().__init__(config)
+
+    def calculate_weighted_statistics(self, column, weights_column, group_column=None,
+                                      quantiles=DEFAULT_QUANTILES, ddof=0):
+        """
+        Calculate weighted mean, quantiles, variance and standard deviation.
+
+        Rows are sorted once by (group, value). The cumulative weight array of the
+        sorted rows is shared by all groups, so every requested quantile of every
+        group is located with a single searchsorted call.
+
+        Args:
+        - column: Name of the value column (e.g., 'arr_delay').
+        - weights_column: Name of the weights column (e.g., 'arr_flights').
+        - group_column: Optional column to group by (e.g., 'carrier' or 'airport').
+        - quantiles: Iterable of quantiles in [0, 1] to report.
+        - ddof: Delta degrees of freedom; 0 for reliability weights, 1 for frequency weights.
+
+        Returns:
+        - DataFrame with one row overall, or one row per group.
+        """
+        if self.data is None or self.data.empty:
+            raise ValueError("Data is not loaded or is empty.")
+
+        for name in (column, weights_column, group_column):
+            if name is not None and name not in self.data.columns:
+                raise KeyError(f"Column '{name}' not found in the dataset.")
+
+        quantiles = np.asarray(quantiles, dtype=float)
+        if np.any((quantiles < 0) | (quantiles > 1)):
+            raise ValueError("Quantiles must be between 0 and 1.")
+
+        values = self.data[column].to_numpy(dtype=float)
+        weights = self.data[weights_column].to_numpy(dtype=float)
+
+        # A single comparison drops NaN and zero weights together (NaN > 0 is False);
+        # only the rejected rows are inspected for negative weights.
+        keep = (weights > 0) & ~np.isnan(values)
+        rejected_weights = weights[~keep]
+        if np.any(rejected_weights < 0):
+            raise ValueError(f"Weights column '{weights_column}' contains negative weights.")
+        dropped = len(values) - int(keep.sum())
+        if dropped:
+            print(f"Ignoring {dropped} rows with missing values or zero/NaN weights.")
+
+        values = values[keep]
+        weights = weights[keep]
+        if group_column is None:
+            codes = np.zeros(len(values), dtype=np.int64)
+            labels = pd.Index(["All"], name="Group")
+        else:
+            codes, labels = pd.factorize(self.data[group_column].to_numpy()[keep], sort=True)
+            labels = pd.Index(labels, name=group_column)
+            # Rows whose group is missing get code -1 and are excluded.
+            present = codes >= 0
+            codes, values, weights = codes[present], values[present], weights[present]
+
+        if len(values) == 0:
+            raise ValueError("No rows with valid values and positive weights.")
+
+        # Sort once by group, then by value within each group
+        order = np.lexsort((values, codes))
+        codes, values, weights = codes[order], values[order], weights[order]
+
+        n_groups = len(labels)
+        starts = np.searchsorted(codes, np.arange(n_groups), side="left")
+        ends = np.searchsorted(codes, np.arange(n_groups), side="right")
+        counts = ends - starts
+        nonempty = counts > 0
+        starts, ends, counts, labels = starts[nonempty], ends[nonempty], counts[nonempty], labels[nonempty]
+
+        total_weight = np.add.reduceat(weights, starts)
+        weighted_sum = np.add.reduceat(values * weights, starts)
+        weighted_mean = weighted_sum / total_weight
+
+        group_index = np.repeat(np.arange(len(starts)), counts)
+        deviations = values - weighted_mean[group_index]
+        denominator = total_weight - ddof
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weighted_var = np.add.reduceat(weights * deviations ** 2, starts) / denominator
+        weighted_var[denominator <= 0] = np.nan
+
+        # Cumulative weights across all sorted rows; each group's quantile target is
+        # offset by the cumulative weight preceding its first row.
+        cumulative = np.cumsum(weights)
+        offsets = cumulative[starts] - weights[starts]
+        targets = offsets[:, None] + quantiles[None, :] * total_weight[:, None]
+        positions = np.searchsorted(cumulative, targets, side="left")
+        positions = np.clip(positions, starts[:, None], (ends - 1)[:, None])
+        quantile_values = values[positions]
+
+        result = pd.DataFrame({
+            "Column": column,
+            "Weights Column": weights_column,
+            "Count": counts,
+            "Total Weight": total_weight,
+            "Weighted Mean": weighted_mean,
+            "Weighted Variance": weighted_var,
+            "Weighted Std": np.sqrt(weighted_var),
+        }, index=labels)
+        for i, q in enumerate(quantiles):
+            label = "Weighted Median" if q == 0.5 else f"Weighted Q{q:g}"
+            result[label] = quantile_values[:, i]
+        result = result.reset_index()
+
+        suffix = f"_by_{group_column}" if group_column else ""
+        self.save_to_output(f"{column}_weighted_statistics{suffix}.csv", result)
+        return result
+
+    def calculate_weighted_median(self, column, weights_column, group_column=None):
+        """
+        Calculate the weighted median, overall or per group.
+
+        Args:
+        - column: Name of the value column.
+        - weights_column: Name of the weights column.
+        - group_column: Optional column to group by.
+
+        Returns:
+        - Weighted median (float) without grouping, otherwise a Series indexed by group.
+        """
+        stats = self.calculate_weighted_statistics(column, weights_column, group_column, quantiles=(0.5,))
+        if group_column is None:
+            return float(stats["Weighted Median"].iloc[0])
+        return stats.set_index(group_column)["Weighted Median"]